@@ -0,0 +1,91 @@
+"""
+block_classifier.py
+
+Check that the batch classifiers label blocks exactly like the
+per-block heuristics they replace, then time both on a large page.
+
+Usage:
+python benchmarks/block_classifier.py [blocks]
+"""
+
+import random
+import sys
+import time
+
+from docsvision.document_model.classifier import (
+    document_classifier,
+    vision_classifier,
+)
+from docsvision.document_model.layout import classify_block_type
+from docsvision.vision.layout_utils import classify_block
+
+EDGE_CASES = [
+    "",
+    " ",
+    "   \n",
+    "TOTAL",
+    "INVOICE",
+    "INVOICE 2024",
+    "Invoice",
+    "x²",
+    "Ⅻ",
+    "٣ items",
+    "ÉTÉ ÉTÉ",
+    "straße",
+    "ǅungla",
+    "A" * 99,
+    "A" * 100,
+    "a" * 49,
+    "a" * 50,
+    "  PADDED HEADING  ",
+]
+
+
+def per_block_document(texts):
+    return [block["type"] for block in classify_block_type(texts)]
+
+
+def synthetic_texts(n, seed=0):
+    rng = random.Random(seed)
+    words = ["TOTAL", "Amount", "due", "INVOICE", "No.", "2024", "the", "of", "x²"]
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+        for _ in range(n)
+    ]
+
+
+def check_parity(texts):
+    expected = [classify_block({"text": t}) for t in texts]
+    assert vision_classifier.classify(texts) == expected, "vision labels differ"
+
+    stripped = [t.strip() for t in texts if t.strip()]
+    assert document_classifier.classify(stripped) == per_block_document(texts), (
+        "document labels differ"
+    )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    texts = synthetic_texts(n) + EDGE_CASES
+
+    check_parity(EDGE_CASES)
+    check_parity(texts)
+    print(f"parity ok on {len(texts):,} blocks")
+
+    _, loop_ms = timed(lambda: [classify_block({"text": t}) for t in texts])
+    _, batch_ms = timed(lambda: vision_classifier.classify(texts))
+    print(f"vision   per-block {loop_ms:8.1f} ms   batch {batch_ms:8.1f} ms")
+
+    _, loop_ms = timed(lambda: per_block_document(texts))
+    _, batch_ms = timed(lambda: document_classifier.classify(texts))
+    print(f"document per-block {loop_ms:8.1f} ms   batch {batch_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+normalize_blocks.py
+
+Memory and time of normalize_ocr_output + build_document_model with the
+slotted Block type, against the previous dict-per-word + uuid4 version.
+
+Usage:
+python benchmarks/normalize_blocks.py [words]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+from docsvision.document_model import build_document_model, classify_block_type
+from docsvision.document_model.blocks import normalize_ocr_output
+
+
+def dict_normalize(raw_ocr):
+    normalized_blocks = []
+
+    for item in raw_ocr:
+        text = " ".join(item.get("text", "").strip().split())
+        if not text:
+            continue
+
+        normalized_blocks.append({
+            "id": str(uuid.uuid4()),
+            "text": text,
+            "bbox": item.get("bbox"),
+            "page": item.get("page", 1),
+            "confidence": float(item.get("confidence", 0)) / 100.0,
+            "block_type": "unknown"
+        })
+
+    return normalized_blocks
+
+
+def dict_build_document_model(ocr_result):
+    normalized_blocks = dict_normalize(ocr_result)
+    blocks = [b["text"] for b in normalized_blocks if b.get("text")]
+
+    pages = {}
+    for b in normalized_blocks:
+        page = b.get("page", 1)
+        text = b.get("text", "").strip()
+        if not text:
+            continue
+        pages.setdefault(page, []).append(text)
+
+    sections = classify_block_type(
+        [b["text"] for b in normalized_blocks if b.get("text")]
+    )
+    return {"blocks": blocks, "pages": pages, "sections": sections}
+
+
+def synthetic_ocr(words, seed=0):
+    rng = random.Random(seed)
+    vocab = ["Invoice", "TOTAL", "2024", "the", "amount:", "ID-42", "Lucknow"]
+    return [
+        {
+            "text": rng.choice(vocab),
+            "bbox": [rng.randint(0, 2400), rng.randint(0, 3400), 2500, 3500],
+            "confidence": rng.uniform(0, 100),
+            "page": i // 500 + 1,
+        }
+        for i in range(words)
+    ]
+
+
+def measure(fn, raw):
+    start = time.perf_counter()
+    fn(raw)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return elapsed, peak
+
+
+def main():
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    raw = synthetic_ocr(words)
+
+    print(f"{words} words")
+    for name, fn in (
+        ("normalize, before", dict_normalize),
+        ("normalize, after", normalize_ocr_output),
+        ("document model, before", dict_build_document_model),
+        ("document model, after", build_document_model),
+    ):
+        elapsed, peak = measure(fn, raw)
+        print(f"{name:<24} {elapsed * 1000:9.1f} ms   peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
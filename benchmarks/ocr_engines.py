@@ -0,0 +1,60 @@
+"""
+ocr_engines.py
+
+Compare per-page latency of the subprocess pytesseract engine against
+the resident tesserocr engine on the same page images.
+
+Usage:
+python benchmarks/ocr_engines.py docsvision/data/raw_docs/sample.png [repeats]
+"""
+
+import sys
+import time
+
+from docsvision.vision.ocr_engine import get_ocr_engine
+from docsvision.vision.pipeline import iter_page_sources
+
+
+def time_engine(name, images, repeats):
+    engine = get_ocr_engine(name)
+
+    # Warm-up: the resident engine pays its language-data load here
+    engine.extract(images[0])
+
+    start = time.perf_counter()
+    words = 0
+    for _ in range(repeats):
+        for img in images:
+            words += len(engine.extract(img))
+    elapsed = time.perf_counter() - start
+
+    pages = repeats * len(images)
+    return elapsed / pages, words // repeats
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python benchmarks/ocr_engines.py <pdf_or_image> [repeats]")
+        sys.exit(1)
+
+    repeats = int(sys.argv[2]) if len(sys.argv) == 3 else 5
+    images = [img for img, _ in iter_page_sources(sys.argv[1], text_layer=False)]
+
+    results = {}
+    for name in ("pytesseract", "tesserocr"):
+        try:
+            results[name] = time_engine(name, images, repeats)
+        except ImportError as e:
+            print(f"⚠️ skipping {name}: {e}")
+            continue
+
+        per_page, words = results[name]
+        print(f"{name:<12} {per_page * 1000:8.1f} ms/page  {words} words/run")
+
+    if len(results) == 2:
+        speedup = results["pytesseract"][0] / results["tesserocr"][0]
+        print(f"tesserocr is x{speedup:.2f} faster per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+ocr_workers.py
+
+Measure process_document throughput (pages/sec) as the worker count grows.
+
+Usage:
+python benchmarks/ocr_workers.py docsvision/data/raw_docs/samples.pdf [max_workers]
+"""
+
+import os
+import sys
+import time
+
+from docsvision.vision.pipeline import process_document
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python benchmarks/ocr_workers.py <pdf_path> [max_workers]")
+        sys.exit(1)
+
+    path = sys.argv[1]
+    max_workers = int(sys.argv[2]) if len(sys.argv) == 3 else (os.cpu_count() or 1)
+
+    worker_counts = sorted({1, 2, 4, 8, max_workers} & set(range(1, max_workers + 1)))
+    baseline = None
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        blocks = process_document(path, workers=workers, text_layer=False)
+        elapsed = time.perf_counter() - start
+
+        pages = len({b["page"] for b in blocks}) or 1
+        rate = pages / elapsed
+        baseline = baseline or rate
+
+        print(
+            f"workers={workers:<3} pages={pages:<5} "
+            f"{rate:8.2f} pages/sec  speedup x{rate / baseline:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
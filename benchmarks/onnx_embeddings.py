@@ -0,0 +1,82 @@
+"""
+onnx_embeddings.py
+
+Parity and speed of the int8 ONNX backend against the torch
+sentence-transformers engine: cosine similarity per chunk, top-5
+retrieval overlap, chunks/sec and single-query latency.
+
+Export the model first:
+python scripts/export_onnx.py
+
+Usage:
+python benchmarks/onnx_embeddings.py [chunks]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from docsvision.core.embedding_engine import SentenceTransformerEmbeddings
+from docsvision.core.onnx_embeddings import OnnxEmbeddings, default_onnx_dir
+
+# Sibling benchmark module (the script's directory is on sys.path)
+from embedding_throughput import synthetic_chunks
+
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return np.asarray(result), time.perf_counter() - start
+
+
+def query_latency_ms(embeddings, queries):
+    start = time.perf_counter()
+    for query in queries:
+        embeddings.embed_query(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    texts = synthetic_chunks(n)
+    queries = texts[:50]
+
+    start = time.perf_counter()
+    reference = SentenceTransformerEmbeddings(MODEL)
+    print(f"torch backend load: {time.perf_counter() - start:.2f} s")
+
+    backends = {"torch": reference}
+    for quantized in (False, True):
+        start = time.perf_counter()
+        backends["onnx int8" if quantized else "onnx fp32"] = OnnxEmbeddings(
+            default_onnx_dir(MODEL),
+            quantized=quantized,
+        )
+        print(f"onnx backend load:  {time.perf_counter() - start:.2f} s")
+
+    expected, _ = timed(lambda: reference.embed_documents(texts))
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    expected_top = np.argsort(-(expected[:50] @ expected.T), axis=1)[:, :5]
+
+    for name, embeddings in backends.items():
+        embeddings.embed_documents(texts[:32])  # warm-up
+        vectors, seconds = timed(lambda: embeddings.embed_documents(texts))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        cosine = (vectors * expected).sum(axis=1)
+        top = np.argsort(-(vectors[:50] @ vectors.T), axis=1)[:, :5]
+        overlap = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(top, expected_top)])
+
+        print(
+            f"{name:<10} {n / seconds:8.1f} chunks/s  "
+            f"query {query_latency_ms(embeddings, queries):6.2f} ms  "
+            f"cosine mean {cosine.mean():.4f} min {cosine.min():.4f}  "
+            f"top-5 overlap {overlap:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+pdf_memory.py
+
+Check that page rendering stays memory-bounded: peak RSS while walking
+a PDF with iter_pdf_images should not grow with the page count.
+
+Usage:
+python benchmarks/pdf_memory.py docsvision/data/raw_docs/samples.pdf [pages]
+"""
+
+import resource
+import sys
+import tempfile
+
+import fitz
+
+from docsvision.vision.pdf_reader import iter_pdf_images, pdf_to_images
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_long_pdf(src_path, pages):
+    src = fitz.open(src_path)
+    out = fitz.open()
+    while out.page_count < pages:
+        out.insert_pdf(src)
+
+    tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+    out.save(tmp.name)
+    return tmp.name
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python benchmarks/pdf_memory.py <pdf_path> [pages]")
+        sys.exit(1)
+
+    pages = int(sys.argv[2]) if len(sys.argv) == 3 else 50
+
+    short_pdf = build_long_pdf(sys.argv[1], 2)
+    long_pdf = build_long_pdf(sys.argv[1], pages)
+
+    for _ in iter_pdf_images(short_pdf):
+        pass
+    short_peak = peak_rss_mb()
+
+    for _ in iter_pdf_images(long_pdf):
+        pass
+    long_peak = peak_rss_mb()
+
+    print(f"streaming  2 pages    : peak RSS {short_peak:8.1f} MB")
+    print(f"streaming {pages:>3} pages    : peak RSS {long_peak:8.1f} MB")
+
+    growth = long_peak - short_peak
+    print(f"growth                : {growth:8.1f} MB")
+
+    # Full-list rendering for comparison (run last: peak RSS never drops)
+    images = pdf_to_images(long_pdf)
+    print(f"pdf_to_images {len(images):>3} pages: peak RSS {peak_rss_mb():8.1f} MB")
+
+    # A single 300 dpi A4 page is ~25 MB; allow a few pages of slack
+    if growth > 100:
+        sys.exit(f"❌ streaming rendering grew by {growth:.1f} MB")
+    print("✅ streaming rendering is memory-bounded")
+
+
+if __name__ == "__main__":
+    main()
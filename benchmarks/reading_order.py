@@ -0,0 +1,77 @@
+"""
+reading_order.py
+
+Compare the NumPy reading-order engine with the previous
+sort-by-bbox[1] on dense synthetic two-column pages.
+
+Usage:
+python benchmarks/reading_order.py [words_per_page] [pages]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from docsvision.document_model.reading_order import reading_order
+
+
+def synthetic_page(words, seed=0):
+    """
+    A title spanning both columns, then two columns of word lines.
+    Word tops jitter by a pixel or two like real OCR output.
+    Returns bboxes and each word's true reading position.
+    """
+    rng = np.random.default_rng(seed)
+    bboxes = [[200, 100, 2300, 160]]
+
+    per_column = (words - 1) // 2
+    words_per_line = 12
+    for col_x in (200, 1300):
+        for i in range(per_column):
+            line, pos = divmod(i, words_per_line)
+            x = col_x + pos * 85
+            y = 250 + line * 45 + int(rng.integers(-2, 3))
+            bboxes.append([x, y, x + 70, y + 30])
+
+    truth = np.arange(len(bboxes))
+    shuffle = rng.permutation(len(bboxes))
+    return np.asarray(bboxes)[shuffle].tolist(), truth[shuffle]
+
+
+def correct_fraction(order, truth):
+    ranked = truth[order]
+    return float(np.mean(ranked == np.arange(len(ranked))))
+
+
+def main():
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    samples = [synthetic_page(words, seed=i) for i in range(pages)]
+
+    def old(bboxes):
+        return np.asarray(sorted(range(len(bboxes)), key=lambda i: bboxes[i][1]))
+
+    as_arrays = [(np.asarray(bboxes, dtype=np.float64), truth) for bboxes, truth in samples]
+
+    for name, fn, inputs in (
+        ("sort by y (before)", old, samples),
+        ("reading_order (after)", reading_order, samples),
+        ("reading_order, arrays", reading_order, as_arrays),
+    ):
+        start = time.perf_counter()
+        orders = [fn(bboxes) for bboxes, _ in inputs]
+        elapsed = time.perf_counter() - start
+
+        accuracy = np.mean([
+            correct_fraction(order, truth)
+            for order, (_, truth) in zip(orders, samples)
+        ])
+        print(
+            f"{name:<22} {elapsed / pages * 1000:7.2f} ms/page   "
+            f"{accuracy:6.1%} blocks in correct position"
+        )
+
+
+if __name__ == "__main__":
+    main()
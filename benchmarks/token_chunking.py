@@ -0,0 +1,87 @@
+"""
+token_chunking.py
+
+Compare character chunking (RecursiveCharacterTextSplitter and the
+span chunker) with token-aware chunking on synthetic pages: throughput
+and how chunk sizes land against the embedding model's token window.
+
+Usage:
+python benchmarks/token_chunking.py [pages] [model_name]
+"""
+
+import random
+import sys
+import time
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from docsvision.core.chunking import Chunker
+
+MAX_TOKENS = 256
+
+
+def synthetic_blocks(pages, blocks_per_page=60, seed=0):
+    rng = random.Random(seed)
+    vocabulary = (
+        "the invoice total amount payable within thirty days of receipt "
+        "customer reference number 2024-0117 quarterly revenue increased "
+        "by 12.5% compared with the previous reporting period"
+    ).split()
+
+    return [
+        {
+            "text": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(3, 18))),
+            "bbox": [0, i * 40, 1000, i * 40 + 30],
+            "page": page,
+        }
+        for page in range(1, pages + 1)
+        for i in range(blocks_per_page)
+    ]
+
+
+def token_lengths(tokenizer, chunks):
+    encoded = tokenizer([c.page_content for c in chunks], add_special_tokens=True, verbose=False)
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+def report(name, chunks, seconds, tokenizer):
+    lengths = token_lengths(tokenizer, chunks)
+    over = sum(n > MAX_TOKENS for n in lengths)
+    print(
+        f"{name:<28} {seconds * 1000:8.1f} ms  "
+        f"{len(chunks):>6} chunks  mean {sum(lengths) / len(lengths):6.1f} tok  "
+        f"max {max(lengths):4}  truncated {over}"
+    )
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    model_name = sys.argv[2] if len(sys.argv) > 2 else "sentence-transformers/all-MiniLM-L6-v2"
+
+    parsed = {"blocks": synthetic_blocks(pages)}
+    token_chunker = Chunker.for_model(model_name, max_tokens=MAX_TOKENS)
+    tokenizer = token_chunker.tokenizer
+
+    # Baseline: one page Document each, split by the recursive splitter
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=500,
+        chunk_overlap=100,
+        separators=["\n\n", "\n", ".", " ", ""],
+    )
+    documents = list(Chunker().iter_documents(parsed, "bench"))
+    start = time.perf_counter()
+    chunks = splitter.split_documents(documents)
+    report("recursive splitter (chars)", chunks, time.perf_counter() - start, tokenizer)
+
+    start = time.perf_counter()
+    chunks = Chunker().build_chunks(parsed, "bench")
+    report("span chunker (chars)", chunks, time.perf_counter() - start, tokenizer)
+
+    start = time.perf_counter()
+    chunks = token_chunker.build_chunks(parsed, "bench")
+    report("span chunker (tokens)", chunks, time.perf_counter() - start, tokenizer)
+
+
+if __name__ == "__main__":
+    main()
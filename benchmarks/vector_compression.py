@@ -0,0 +1,98 @@
+"""
+vector_compression.py
+
+Memory and recall@k of compressed vector storage against the float32
+store, with and without full-precision rescoring of the candidates.
+
+By default the vectors are synthetic (normalized, low intrinsic
+dimension, like sentence embeddings); pass "real" to embed synthetic
+chunks with the configured embedding model instead.
+
+Usage:
+python benchmarks/vector_compression.py [vectors] [real]
+"""
+
+import sys
+
+import numpy as np
+
+from docsvision.core.quantization import VectorCodec
+
+K = 10
+RESCORE_CANDIDATES = 4 * K
+SPECS = [
+    "float16",
+    "int8",
+    "pca192-float32",
+    "pca128-float32",
+    "pca128-float16",
+    "pca128-int8",
+    "pca64-int8",
+    "matryoshka128-float32",
+]
+
+
+def synthetic_vectors(n, dim=384, latent=48, seed=0):
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((latent, dim)).astype(np.float32)
+    weights = rng.standard_normal((n, latent)).astype(np.float32) * np.linspace(2, 0.2, latent)
+    vectors = weights @ basis + 0.3 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def real_vectors(n):
+    from docsvision.core.embedding import get_embeddings
+
+    # Sibling benchmark module (the script's directory is on sys.path)
+    from embedding_throughput import synthetic_chunks
+
+    embeddings = get_embeddings(cache=False)
+    return np.asarray(embeddings.embed_documents(synthetic_chunks(n)), dtype=np.float32)
+
+
+def top_k(queries, vectors, k):
+    # L2 ranking, as Chroma's default space does
+    distances = (
+        (queries ** 2).sum(axis=1)[:, None]
+        - 2 * queries @ vectors.T
+        + (vectors ** 2).sum(axis=1)[None, :]
+    )
+    return np.argsort(distances, axis=1)[:, :k]
+
+
+def recall(found, expected):
+    return np.mean([len(set(f) & set(e)) / len(e) for f, e in zip(found, expected)])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    vectors = real_vectors(n) if "real" in sys.argv[2:] else synthetic_vectors(n)
+    queries, vectors = vectors[:200], vectors[200:]
+    dim = vectors.shape[1]
+
+    expected = top_k(queries, vectors, K)
+    base_bytes = len(vectors) * dim * 4
+    print(f"{len(vectors):,} x {dim} float32: {base_bytes / 2**20:.1f} MiB")
+    print(f"{'spec':<24}{'native MiB':>11}{'in Chroma':>11}{'recall@10':>11}{'rescored':>10}")
+
+    for spec in SPECS:
+        codec = VectorCodec.from_spec(spec).fit(vectors[:5000])
+        stored = codec.decode(codec.encode(vectors))
+        reduced_queries = codec.reduce(queries)
+
+        found = top_k(reduced_queries, stored, K)
+        candidates = top_k(reduced_queries, stored, RESCORE_CANDIDATES)
+        rescored = np.array([
+            c[np.argsort(-(vectors[c] @ q))[:K]] for c, q in zip(candidates, queries)
+        ])
+
+        native = len(vectors) * codec.bytes_per_vector(dim)
+        chroma = len(vectors) * (codec.dim or dim) * 4
+        print(
+            f"{spec:<24}{native / 2**20:>11.1f}{chroma / 2**20:>11.1f}"
+            f"{recall(found, expected):>11.3f}{recall(rescored, expected):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+vector_store.py
+
+Query latency, QPS and recall@k of the in-process MmapVectorStore
+(exact NumPy search, int8 rows, HNSW) against Chroma, on synthetic
+normalized vectors. Vectors are precomputed, so only the store is
+timed (similarity_search_by_vector), not the embedding model.
+
+Usage:
+python benchmarks/vector_store.py [vectors] [queries]
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import Embeddings
+
+from docsvision.core.mmap_store import MmapVectorStore
+from docsvision.core.quantization import CompressedEmbeddings, VectorCodec
+
+# Sibling benchmark module (the script's directory is on sys.path)
+from vector_compression import recall, synthetic_vectors
+
+K = 10
+BATCH = 5000
+
+
+class PrecomputedEmbeddings(Embeddings):
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return self.vectors[[int(t) for t in texts]].tolist()
+
+    def embed_query(self, text):
+        return self.vectors[int(text)].tolist()
+
+
+def fill(store, n):
+    start = time.perf_counter()
+    for i in range(0, n, BATCH):
+        texts = [str(j) for j in range(i, min(i + BATCH, n))]
+        store.add_texts(texts, [{"row": int(t)} for t in texts], ids=texts)
+    return time.perf_counter() - start
+
+
+def run_queries(store, queries):
+    found, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        docs = store.similarity_search_by_vector(q.tolist(), k=K)
+        latencies.append(time.perf_counter() - start)
+        found.append([int(d.page_content) for d in docs])
+    return found, np.array(latencies)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    vectors = synthetic_vectors(n + n_queries)
+    queries, vectors = vectors[:n_queries], vectors[n_queries:]
+    expected = np.argsort(-(queries @ vectors.T), axis=1)[:, :K]
+    embeddings = PrecomputedEmbeddings(vectors)
+
+    int8 = CompressedEmbeddings(embeddings, VectorCodec("int8"))
+    int8.codec.fit(vectors[:5000])
+
+    def stores(tmp):
+        yield "chroma", lambda: Chroma(
+            embedding_function=embeddings,
+            persist_directory=f"{tmp}/chroma",
+            collection_name="bench",
+            collection_metadata={"hnsw:space": "cosine"},
+        )
+        yield "mmap exact", lambda: MmapVectorStore(
+            embeddings, f"{tmp}/mmap", "exact", hnsw_threshold=n + 1
+        )
+        yield "mmap exact int8", lambda: MmapVectorStore(
+            int8, f"{tmp}/mmap", "int8", hnsw_threshold=n + 1
+        )
+        yield "mmap hnsw", lambda: MmapVectorStore(
+            embeddings, f"{tmp}/mmap", "hnsw", hnsw_threshold=0
+        )
+
+    print(f"{n:,} vectors x {vectors.shape[1]}, {n_queries} queries, k={K}")
+    print(
+        f"{'store':<18}{'insert s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'QPS':>9}{'recall@10':>11}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, open_store in stores(tmp):
+            store = open_store()
+            insert = fill(store, n)
+            run_queries(store, queries[:10])  # warm up (builds the HNSW graph)
+
+            found, latencies = run_queries(store, queries)
+            print(
+                f"{name:<18}{insert:>9.2f}"
+                f"{np.percentile(latencies, 50) * 1e3:>9.2f}"
+                f"{np.percentile(latencies, 95) * 1e3:>9.2f}"
+                f"{len(latencies) / latencies.sum():>9.0f}"
+                f"{recall(found, expected):>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
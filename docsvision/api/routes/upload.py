@@ -1,33 +1,52 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
+import hashlib
 import tempfile
-import shutil
 from pathlib import Path
 
+from docsvision.document_model.columnar import SUFFIX as COLUMNAR_SUFFIX
 from docsvision.scripts.ingest import main as ingest_main
 
 router = APIRouter()
 
+SUPPORTED_SUFFIXES = {".json", COLUMNAR_SUFFIX}
+
 @router.post("/")
 async def upload_document(file: UploadFile = File(...)):
-    if not file.filename.endswith(".json"):
+    suffix = Path(file.filename).suffix
+    if suffix not in SUPPORTED_SUFFIXES:
         raise HTTPException(
             status_code=400,
-            detail="Only parsed JSON files are supported for now."
+            detail="Only parsed JSON or .dvb files are supported for now."
         )
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as tmp:
-        shutil.copyfileobj(file.file, tmp)
+    # The upload is keyed on its content, not on the temporary copy, so
+    # uploading the same file again embeds nothing new
+    digest = hashlib.md5()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        while chunk := file.file.read(1 << 20):
+            digest.update(chunk)
+            tmp.write(chunk)
         tmp_path = Path(tmp.name)
 
     try:
-        ingest_main(str(tmp_path))
+        stats = ingest_main(
+            str(tmp_path),
+            doc_id=digest.hexdigest(),
+            source_name=file.filename,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Ingestion failed: {str(e)}"
         )
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
     return {
         "status": "success",
-        "message": "Document uploaded and indexed successfully"
+        "message": "Document uploaded and indexed successfully",
+        "added": stats.added,
+        "updated": stats.updated,
+        "unchanged": stats.unchanged,
+        "removed": stats.removed,
     }
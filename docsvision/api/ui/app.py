@@ -2,12 +2,15 @@ import streamlit as st
 import tempfile
 from pathlib import Path
 
+from docsvision.vision.ocr_cache import OCRCache
 from docsvision.vision.pipeline import process_document
 from docsvision.document_model import build_document_model
 from docsvision.scripts.query import (
     init_rag_runtime,
     answer_query_from_ui,
     ingest_doc_model_into_vectordb,
+    sync_doc_model_pages_into_vectordb,
+    use_document,
 )
 
 #-------------- Session State ----------------
@@ -26,6 +29,12 @@ if "doc_ingested" not in st.session_state:
 if "rag_runtime" not in st.session_state:
     st.session_state.rag_runtime = None
 
+if "appended_hashes" not in st.session_state:
+    st.session_state.appended_hashes = set()
+
+if "ocr_cache" not in st.session_state:
+    st.session_state.ocr_cache = OCRCache()
+
 
 # ---------------- Page Config ----------------
 st.set_page_config(page_title="DocsVision AI", layout="wide")
@@ -55,15 +64,20 @@ if uploaded_file is not None:
 
     if st.session_state.get("file_hash") != new_hash:
         st.session_state.file_hash = new_hash
-        st.session_state.doc_ingested = False
         st.session_state.doc_model = None     
         st.session_state.ocr_result = None     
+        st.session_state.appended_hashes = set()
 
-        # 🔥 clear vector DB for new document
-        vectordb = st.session_state.rag_runtime["vectordb"]
-        existing = vectordb.get()
-        if existing and existing.get("ids"):
-            vectordb.delete(ids=existing["ids"])
+        # Each file gets its own collection; one indexed before is reused
+        # with its stored document model, without running OCR again
+        st.session_state.doc_ingested = use_document(
+            st.session_state.rag_runtime, new_hash
+        )
+        if st.session_state.doc_ingested:
+            st.session_state.doc_model = (
+                st.session_state.rag_runtime["collections"].load_model(new_hash)
+            )
+            st.sidebar.caption("Already indexed — reusing stored vectors")
 
 
 # ---------------- Document Processing ----------------
@@ -74,15 +88,24 @@ if uploaded_file and st.session_state.doc_model is None:
         tmp.write(uploaded_file.read())
         file_path = Path(tmp.name)
 
+    extraction_stats = {}
     with st.spinner("Running OCR & layout analysis..."):
-        ocr_result = process_document(file_path)
+        ocr_result = process_document(
+            file_path,
+            stats=extraction_stats,
+            cache=st.session_state.ocr_cache,
+            granularity="line",
+        )
         doc_model = build_document_model(ocr_result)
 
     st.session_state.ocr_result = ocr_result
     st.session_state.doc_model = doc_model
-    st.session_state.doc_ingested = False
 
     st.sidebar.success("Document processed successfully ✅")
+    st.sidebar.caption(
+        f"Text layer: {extraction_stats.get('text_layer', 0)} pages · "
+        f"OCR: {extraction_stats.get('ocr', 0)} pages"
+    )
 
 # ---------------- Safe Ingestion (ONCE) ----------------
 
@@ -92,11 +115,62 @@ if (
     and not st.session_state.doc_ingested
 ):
     with st.spinner("Indexing document for search..."):
-        ingest_doc_model_into_vectordb(
+        dedup_stats, upsert_stats = ingest_doc_model_into_vectordb(
             st.session_state.doc_model,
-            st.session_state.rag_runtime["vectordb"]
+            st.session_state.rag_runtime["vectordb"],
+            source_name=uploaded_file.name,
+            doc_id=st.session_state.file_hash,
+        )
+        # Saved only now: a stored model marks the collection complete
+        st.session_state.rag_runtime["collections"].save_model(
+            st.session_state.file_hash, st.session_state.doc_model
         )
     st.session_state.doc_ingested = True
+    st.sidebar.caption(
+        f"Indexed {upsert_stats.added} new chunks · "
+        f"{upsert_stats.unchanged} unchanged · "
+        f"{dedup_stats.saved} duplicates skipped"
+    )
+
+# ---------------- Append Pages (incremental) ----------------
+if st.session_state.doc_model is not None and st.session_state.doc_ingested:
+    with st.sidebar:
+        extra_file = st.file_uploader(
+            "Add pages to this document",
+            type=["pdf", "png", "jpg", "jpeg"],
+            key="extra_pages",
+        )
+
+    if extra_file is not None:
+        extra_hash = file_hash(extra_file)
+
+        if extra_hash not in st.session_state.appended_hashes:
+            suffix = Path(extra_file.name).suffix
+
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                tmp.write(extra_file.read())
+                extra_path = Path(tmp.name)
+
+            with st.spinner("Processing and indexing new pages..."):
+                extra_ocr = process_document(
+                    extra_path,
+                    cache=st.session_state.ocr_cache,
+                    granularity="line",
+                )
+                changes = st.session_state.doc_model.append_pages(extra_ocr)
+                sync_doc_model_pages_into_vectordb(
+                    st.session_state.doc_model,
+                    st.session_state.rag_runtime["vectordb"],
+                    changes,
+                    source_name=uploaded_file.name,
+                    doc_id=st.session_state.file_hash,
+                )
+
+            st.session_state.rag_runtime["collections"].save_model(
+                st.session_state.file_hash, st.session_state.doc_model
+            )
+            st.session_state.appended_hashes.add(extra_hash)
+            st.sidebar.success(f"Added {len(changes.added)} pages ✅")
 
 doc_model = st.session_state.doc_model
 
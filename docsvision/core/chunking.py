@@ -2,100 +2,442 @@
 chunking.py
 
 Responsibility:
-- Convert DocsVision parsed JSON into LangChain Documents
+- Convert DocsVision parsed JSON (or columnar .dvb / document model
+  blocks) into LangChain Documents
 - Apply text chunking
-- Preserve metadata for retrieval & citation
+- Preserve metadata for retrieval & citation (page, char offsets, bboxes)
 """
 
-from typing import List, Dict
+import json
+import os
+from bisect import bisect_left, bisect_right
+from functools import cache
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from docsvision.document_model.columnar import ColumnarDocument
+
+CHUNK_UNITS = ("chars", "tokens")
+
+
+class PageText(NamedTuple):
+    """
+    One page's block texts joined by single spaces.
+
+    ``starts[i]`` is the char offset of block ``i`` in ``text`` and
+    ``bboxes[i]`` its box, so any span of ``text`` maps back to the
+    blocks it came from.
+    """
+
+    page: int
+    text: str
+    starts: List[int]
+    bboxes: List[Optional[List[int]]]
+
+
+def _page_text(page: int, texts: List[str], bboxes: List) -> PageText:
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+
+    return PageText(page, " ".join(texts), starts, bboxes)
+
+
+def _block_pages(blocks: Iterable) -> Iterator[PageText]:
+    """
+    Group consecutive non-empty blocks by page. Accepts block dicts or
+    document_model Blocks.
+    """
+    texts: List[str] = []
+    bboxes: List = []
+    current_page = None
+
+    for block in blocks:
+        text = block.get("text", "").strip()
+        page = block.get("page")
+
+        if not text:
+            continue
+
+        # New page → flush buffer
+        if current_page is not None and page != current_page:
+            yield _page_text(current_page, texts, bboxes)
+            texts, bboxes = [], []
+
+        current_page = page
+        texts.append(text)
+        bboxes.append(block.get("bbox"))
+
+    if texts:
+        yield _page_text(current_page, texts, bboxes)
+
+
+def _columnar_pages(doc: ColumnarDocument) -> Iterator[PageText]:
+    """
+    Same grouping as _block_pages, straight from the columnar arrays
+    without building per-block dicts.
+    """
+    for (page, start, end), (_, raw_texts) in zip(doc.page_runs(), doc.iter_page_texts()):
+        texts, bboxes = [], []
+        for text, bbox in zip(raw_texts, doc.bboxes[start:end].tolist()):
+            text = text.strip()
+            if text:
+                texts.append(text)
+                bboxes.append(bbox)
+
+        if texts:
+            yield _page_text(page, texts, bboxes)
+
+
+def _drop_sparse_pages(pages: Iterable[PageText]) -> Iterator[PageText]:
+    # Intermediate pages need more than 100 chars to be kept, the last
+    # page more than 20
+    previous = None
+
+    for page in pages:
+        if previous is not None and len(previous.text) > 100:
+            yield previous
+        previous = page
+
+    if previous is not None and len(previous.text) > 20:
+        yield previous
+
+
+def _char_spans(
+    text: str,
+    starts: List[int],
+    chunk_size: int,
+    chunk_overlap: int,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) offsets of overlapping chunks of ``text``.
+
+    Chunks end on a block boundary when one falls in the second half of
+    the window, otherwise on the last space, otherwise mid-word. Every
+    search is bounded by the window, so splitting is linear in the page
+    length.
+    """
+    n = len(text)
+    start = 0
+
+    while start < n:
+        end = start + chunk_size
+        if end >= n:
+            yield start, n
+            return
+
+        boundary = starts[bisect_right(starts, end) - 1]
+        if boundary > start + chunk_size // 2:
+            cut = boundary - 1
+        else:
+            cut = text.rfind(" ", start + 1, end + 1)
+            if cut <= start:
+                cut = end
+
+        yield start, cut
+
+        # Step back by the overlap, then forward to the next word start
+        next_start = max(cut - chunk_overlap, start + 1)
+        if text[next_start - 1] != " ":
+            space = text.find(" ", next_start, cut)
+            next_start = cut if space == -1 else space + 1
+        while next_start < n and text[next_start] == " ":
+            next_start += 1
+
+        start = next_start
+
+
+def _token_spans(
+    starts: List[int],
+    words: List[str],
+    token_counts: List[int],
+    chunk_size: int,
+    chunk_overlap: int,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Token-budget counterpart of _char_spans; yields char offsets.
+
+    ``words`` is ``text.split(" ")`` and ``token_counts`` their token
+    counts, so windows are found by bisecting a prefix sum. Chunks end
+    on a block boundary when one falls in the second half of the window,
+    otherwise on the last word that fits. A single word longer than the
+    window becomes its own (truncated-by-the-model) chunk.
+    """
+    word_starts = list(accumulate((len(w) + 1 for w in words), initial=0))
+    prefix = list(accumulate(token_counts, initial=0))
+    block_starts = set(starts)
+    n = len(words)
+    i = 0
+
+    while i < n:
+        j = max(bisect_right(prefix, prefix[i] + chunk_size, lo=i + 1) - 1, i + 1)
+        if j < n:
+            for k in range(j, i + (j - i) // 2, -1):
+                if word_starts[k] in block_starts:
+                    j = k
+                    break
+
+        # Skip empty words from repeated spaces at the edges
+        first, last = i, j
+        while first < last and not words[first]:
+            first += 1
+        while last > first and not words[last - 1]:
+            last -= 1
+        if first < last:
+            yield word_starts[first], word_starts[last - 1] + len(words[last - 1])
+
+        if j >= n:
+            return
+
+        # Step back by at most chunk_overlap tokens
+        next_i = bisect_left(prefix, prefix[j] - chunk_overlap, lo=i + 1, hi=j)
+        i = max(next_i, i + 1)
+
+
+def _span_document(
+    page: PageText,
+    start: int,
+    end: int,
+    source_name: str,
+    doc_id: Optional[str] = None,
+) -> Document:
+    first = bisect_right(page.starts, start) - 1
+    last = bisect_left(page.starts, end)
+
+    return Document(
+        page_content=page.text[start:end],
+        metadata={
+            "page": page.page,
+            "source": source_name,
+            # Identity of the ingested file; names are not unique
+            "doc_id": doc_id or source_name,
+            "start_index": start,
+            "end_index": end,
+            # Chroma metadata values must be scalars
+            "bboxes": json.dumps(page.bboxes[first:last]),
+        },
+    )
 
 
 class Chunker:
+    """
+    Streaming, provenance-preserving chunker.
+
+    Pages are split into overlapping spans; every chunk keeps its real
+    page number, its char offsets in the page text and the boxes of the
+    blocks it covers.
+
+    Sizes are in characters by default. With a fast (Rust) tokenizer
+    they are in tokens (see for_model). Token counts are cached per
+    whitespace-separated word, so each distinct word is tokenized once
+    per chunker; for WordPiece models such as MiniLM, words tokenize
+    independently and the counts are exact.
+    """
+
     def __init__(
         self,
         chunk_size: int = 500,
         chunk_overlap: int = 100,
+        tokenizer=None,
     ):
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        if tokenizer is not None and not getattr(tokenizer, "is_fast", False):
+            raise ValueError("Token-aware chunking needs a fast (Rust) tokenizer")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.tokenizer = tokenizer
+        self._token_counts: Dict[str, int] = {}
+
+    @classmethod
+    def for_model(
+        cls,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_tokens: int = 256,
+        chunk_overlap: int = 32,
+    ) -> "Chunker":
+        """
+        Token-aware chunker sized to an embedding model's input window.
+
+        ``max_tokens`` is the model's sequence limit (256 for MiniLM);
+        room for the special tokens the model adds is reserved.
+        """
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        return cls(
+            chunk_size=max_tokens - tokenizer.num_special_tokens_to_add(),
             chunk_overlap=chunk_overlap,
-            separators=["\n\n", "\n", ".", " ", ""],
+            tokenizer=tokenizer,
         )
 
+    def iter_pages(
+        self,
+        parsed: Union[Dict, ColumnarDocument, Iterable],
+        drop_sparse: bool = True,
+    ) -> Iterator[PageText]:
+        """
+        Lazily yield one PageText per page.
+
+        `parsed` can be a parsed dict, a ColumnarDocument, or any
+        iterable of blocks (e.g. json_stream.iter_json_array or a
+        document model's records), so pages are emitted while the rest
+        of the input is still being read.
+        """
+        if isinstance(parsed, ColumnarDocument):
+            pages = _columnar_pages(parsed)
+        elif isinstance(parsed, dict):
+            pages = _block_pages(parsed.get("blocks", []))
+        else:
+            pages = _block_pages(parsed)
+
+        return _drop_sparse_pages(pages) if drop_sparse else pages
+
+    def _count_tokens(self, words: List[str]) -> List[int]:
+        counts = self._token_counts
+        missing = list({w for w in words if w not in counts})
+
+        if missing:
+            encoded = self.tokenizer.backend_tokenizer.encode_batch(
+                missing,
+                add_special_tokens=False,
+            )
+            for word, encoding in zip(missing, encoded):
+                counts[word] = len(encoding.ids)
+
+        return [counts[w] for w in words]
+
+    def _split(self, text: str, starts: List[int]) -> Iterator[Tuple[int, int]]:
+        if self.tokenizer is None:
+            return _char_spans(text, starts, self.chunk_size, self.chunk_overlap)
+
+        words = text.split(" ")
+        return _token_spans(
+            starts,
+            words,
+            self._count_tokens(words),
+            self.chunk_size,
+            self.chunk_overlap,
+        )
+
+    def split_page(self, page: PageText) -> Iterator[Tuple[int, int]]:
+        return self._split(page.text, page.starts)
+
+    def iter_page_chunks(
+        self,
+        pages: Iterable[PageText],
+        source_name: str,
+        doc_id: Optional[str] = None,
+    ) -> Iterator[Document]:
+        for page in pages:
+            for start, end in self.split_page(page):
+                yield _span_document(page, start, end, source_name, doc_id)
+
     def json_to_documents(
     self,
-    parsed_json: Dict,
+    parsed_json: Union[Dict, ColumnarDocument],
     source_name: str,
 ) -> List[Document]:
+        """
+        Build one Document per page from a parsed dict or a
+        memory-mapped ColumnarDocument.
+        """
+        return list(self.iter_documents(parsed_json, source_name))
+
+    def iter_documents(
+        self,
+        parsed: Union[Dict, ColumnarDocument, Iterable],
+        source_name: str,
+    ) -> Iterator[Document]:
+        """
+        Lazily yield one (unsplit) Document per page.
+        """
+        for page in self.iter_pages(parsed):
+            yield Document(
+                page_content=page.text,
+                metadata={
+                    "page": page.page,
+                    "source": source_name,
+                },
+            )
 
-        documents: List[Document] = []
-
-        blocks = parsed_json.get("blocks", [])
-
-        buffer = []
-        current_page = None
-
-        for block in blocks:
-            text = block.get("text", "").strip()
-            page = block.get("page")
-
-            if not text:
-                continue
-
-            # New page → flush buffer
-            if current_page is not None and page != current_page:
-                combined_text = " ".join(buffer).strip()
-                if len(combined_text) > 100:
-                    documents.append(
-                        Document(
-                            page_content=f"[Page {current_page}]\n{combined_text}",
-                            metadata={
-                                "page": current_page,
-                                "source": source_name,
-                         },
-                        )
-                     )
-                buffer = []
-
-            current_page = page
-            buffer.append(text)
-
-        # Flush last page
-        if buffer:
-            combined_text = " ".join(buffer).strip()
-            if len(combined_text) > 20:
-                documents.append(
+    def chunk_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Split arbitrary Documents, keeping their metadata and adding
+        char offsets.
+        """
+        chunks = []
+        for document in documents:
+            text = document.page_content
+            for start, end in self._split(text, [0]):
+                chunks.append(
                     Document(
-                        page_content=f"[Page {current_page}]\n{combined_text}",
+                        page_content=text[start:end],
                         metadata={
-                            "page": current_page,
-                            "source": source_name,
+                            **document.metadata,
+                            "start_index": start,
+                            "end_index": end,
                         },
                     )
                 )
+        return chunks
 
-        return documents
-
-
-
-    def chunk_documents(self, documents: List[Document]) -> List[Document]:
+    def iter_chunks(
+        self,
+        parsed: Union[Dict, ColumnarDocument, Iterable],
+        source_name: str,
+        doc_id: Optional[str] = None,
+    ) -> Iterator[Document]:
         """
-        Splits documents into semantically meaningful chunks.
+        Streaming counterpart of build_chunks: pages are split as soon
+        as they are complete. ``doc_id`` (default: ``source_name``)
+        identifies the file in the vector store.
         """
-        chunks = self.splitter.split_documents(documents)
-        return chunks
+        return self.iter_page_chunks(self.iter_pages(parsed), source_name, doc_id)
 
     def build_chunks(
         self,
-        parsed_json: Dict,
+        parsed_json: Union[Dict, ColumnarDocument],
         source_name: str,
     ) -> List[Document]:
         """
         End-to-end helper:
         JSON -> Documents -> Chunks
         """
-        documents = self.json_to_documents(parsed_json, source_name)
-        chunks = self.chunk_documents(documents)
-        return chunks
+        return list(self.iter_chunks(parsed_json, source_name))
+
+
+@cache
+def _model_chunker(model_name: str) -> Chunker:
+    return Chunker.for_model(model_name)
+
+
+def get_chunker(
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    unit: Optional[str] = None,
+    chunk_size: int = 500,
+    chunk_overlap: int = 100,
+) -> Chunker:
+    """
+    Chunker used by the ingestion paths.
+
+    ``unit`` (default: $DOCSVISION_CHUNK_UNIT or "chars") selects
+    ``chunk_size``-character chunks, or "tokens": chunks sized to the
+    input window of the embedding model ``model_name`` (see
+    Chunker.for_model; loaded once per process and model, so the word
+    token counts are shared across documents).
+    """
+    if unit is None:
+        unit = os.environ.get("DOCSVISION_CHUNK_UNIT", "chars")
+    if unit not in CHUNK_UNITS:
+        raise ValueError(
+            f"Unknown chunk unit '{unit}'. Choose from: {', '.join(CHUNK_UNITS)}"
+        )
+
+    if unit == "tokens":
+        return _model_chunker(model_name)
+    return Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
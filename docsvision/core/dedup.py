@@ -0,0 +1,169 @@
+"""
+dedup.py
+
+Responsibility:
+- Drop exact and near-duplicate chunks before they are embedded
+  (repeated headers/footers, boilerplate, duplicated pages)
+- Keep the pages of dropped duplicates on the chunk that is kept
+- Count the embeddings saved
+"""
+
+import hashlib
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+@dataclass
+class DedupStats:
+    total: int = 0
+    exact: int = 0
+    near: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Embeddings (and vector slots) not spent on duplicates."""
+        return self.exact + self.near
+
+    @property
+    def kept(self) -> int:
+        return self.total - self.saved
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _merge_pages(kept: dict, duplicate: Document) -> None:
+    pages = {int(p) for p in kept["pages"].split(",") if p}
+    page = duplicate.metadata.get("page")
+    if page is not None:
+        pages.add(page)
+    kept["pages"] = ",".join(str(p) for p in sorted(pages))
+
+
+class ChunkDeduplicator:
+    """
+    Exact hashing plus MinHash/LSH near-duplicate detection.
+
+    Chunks are compared within the same file (``doc_id``, else
+    ``source``) only. The first occurrence is kept; later duplicates
+    are dropped and their page is added to the kept chunk's ``pages``
+    metadata (a comma-separated string, since Chroma metadata must be
+    scalar). Only the metadata and MinHash signature of kept chunks are
+    retained, not their text.
+
+    Near duplicates are chunks whose word-shingle Jaccard similarity,
+    estimated from ``num_perm`` MinHash values, is at least
+    ``threshold``. LSH with ``bands`` bands keeps lookups O(1) per chunk.
+
+    State is kept across calls, so one instance also catches chunks
+    repeated between batches of the same ingestion.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        # Multiply-shift hash family: h(x) = (a * x + b) >> 32, a odd
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=(num_perm, 1), dtype=np.uint64)
+
+        self.stats = DedupStats()
+        # Kept chunks are tracked by their (mutable) metadata dicts
+        self._exact: Dict[Tuple[str, bytes], dict] = {}
+        self._buckets: Dict[Tuple[str, int, bytes], List[int]] = {}
+        self._kept: List[Tuple[dict, np.ndarray]] = []
+
+    def _signature(self, normalized: str) -> np.ndarray:
+        words = normalized.split(" ")
+        k = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        return ((self._a * hashes + self._b) >> np.uint64(32)).min(axis=1)
+
+    def _find_near(self, source: str, signature: np.ndarray) -> Tuple[Optional[dict], List]:
+        keys = [
+            (source, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+        seen = set()
+        for key in keys:
+            for index in self._buckets.get(key, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+
+                kept, kept_signature = self._kept[index]
+                if np.mean(kept_signature == signature) >= self.threshold:
+                    return kept, keys
+
+        return None, keys
+
+    def add(self, document: Document) -> bool:
+        """
+        Register one chunk. Returns True if it should be embedded,
+        False if it duplicates a chunk already kept.
+        """
+        self.stats.total += 1
+        source = document.metadata.get("doc_id") or document.metadata.get("source", "")
+        normalized = _normalize(document.page_content)
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+        kept = self._exact.get((source, digest))
+        if kept is not None:
+            self.stats.exact += 1
+            _merge_pages(kept, document)
+            return False
+
+        signature = self._signature(normalized)
+        kept, keys = self._find_near(source, signature)
+        if kept is not None:
+            self.stats.near += 1
+            _merge_pages(kept, document)
+            return False
+
+        page = document.metadata.get("page")
+        document.metadata["pages"] = "" if page is None else str(page)
+
+        self._exact[(source, digest)] = document.metadata
+        index = len(self._kept)
+        self._kept.append((document.metadata, signature))
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+
+        return True
+
+    def deduplicate(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Yield the chunks worth embedding as they stream through.
+
+        A yielded chunk's ``pages`` metadata keeps growing while later
+        duplicates arrive, so the consumer must write metadata once the
+        stream is exhausted (upsert_documents refreshes it).
+        """
+        for document in documents:
+            if self.add(document):
+                yield document
@@ -2,22 +2,73 @@
 embedding.py
 
 Responsibility:
-- Initialize HuggingFace embeddings for DocsVision
+- Initialize the embedding backend for DocsVision (torch
+  sentence-transformers or int8 ONNX on onnxruntime)
+- Put the persistent embedding cache in front of the model
 """
 
-from langchain_huggingface import HuggingFaceEmbeddings
+import os
+from typing import Optional
+
+from docsvision.core.embedding_cache import CachedEmbeddings
+from docsvision.core.embedding_engine import SentenceTransformerEmbeddings
+from docsvision.core.onnx_embeddings import OnnxEmbeddings, default_onnx_dir
+
+EMBEDDING_BACKENDS = ("torch", "onnx")
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
 
 def get_embeddings(
-    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    cache: bool = True,
+    cache_path: str = "storage/embedding_cache.sqlite",
+    batch_size: int = 64,
+    workers: Optional[int] = None,
+    backend: Optional[str] = None,
 ):
     """
-    Returns a HuggingFaceEmbeddings instance.
+    Returns the embedding model, wrapped in a CachedEmbeddings unless
+    ``cache`` is False.
 
     Args:
         model_name: Explicit HF embedding model
+        cache: Reuse vectors of previously embedded texts
+        cache_path: SQLite file backing the cache
+        batch_size: Texts per forward pass
+        workers: Encoder processes, torch backend only
+            (default: $DOCSVISION_EMBED_WORKERS or 1)
+        backend: "torch" or "onnx" (default: $DOCSVISION_EMBEDDING_BACKEND
+            or "torch"). The ONNX model is read from
+            $DOCSVISION_ONNX_DIR or storage/onnx/<model_name>.
 
     Returns:
-        HuggingFaceEmbeddings
+        CachedEmbeddings (or the bare backend)
     """
-    return HuggingFaceEmbeddings(model_name=model_name)
+    if backend is None:
+        backend = os.environ.get("DOCSVISION_EMBEDDING_BACKEND", "torch")
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend '{backend}'. Choose from: {', '.join(EMBEDDING_BACKENDS)}"
+        )
+
+    if backend == "onnx":
+        embeddings = OnnxEmbeddings(
+            os.environ.get("DOCSVISION_ONNX_DIR") or default_onnx_dir(model_name),
+            batch_size=batch_size,
+        )
+        # int8 vectors differ slightly; never mix them with torch ones
+        cache_model_name = f"{model_name}@onnx-int8"
+    else:
+        if workers is None:
+            workers = int(os.environ.get("DOCSVISION_EMBED_WORKERS", "1"))
+        embeddings = SentenceTransformerEmbeddings(
+            model_name=model_name,
+            batch_size=batch_size,
+            workers=workers,
+        )
+        cache_model_name = model_name
+
+    if not cache:
+        return embeddings
+
+    return CachedEmbeddings(embeddings, model_name=cache_model_name, cache_path=cache_path)
@@ -0,0 +1,191 @@
+"""
+embedding_cache.py
+
+Responsibility:
+- Persistent embedding cache shared by every ingestion path
+- Keyed by embedding model name + chunk text hash (SQLite on disk)
+- Size-bounded with least-recently-used eviction and hit-rate stats
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# SQLite's default limit on host parameters per statement is 999+
+_SQL_BATCH = 500
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only calls the wrapped model for texts it
+    has not embedded before.
+
+    Vectors are stored as float32 blobs, so cached and fresh results
+    are identical for float32 models. Entries past ``max_bytes`` are
+    evicted oldest-use first, down to 90% of the budget.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        cache_path: str | Path = "storage/embedding_cache.sqlite",
+        max_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared by FastAPI/Streamlit worker threads
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key BLOB PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._db.commit()
+
+        self.hits = 0
+        self.misses = 0
+        (self._size,) = self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+
+    def _key(self, text: str) -> bytes:
+        h = hashlib.sha256()
+        h.update(self.model_name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(text.encode("utf-8"))
+        return h.digest()
+
+    def _lookup(self, keys: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        found = {}
+        unique = list(dict.fromkeys(keys))
+
+        for i in range(0, len(unique), _SQL_BATCH):
+            batch = unique[i:i + _SQL_BATCH]
+            rows = self._db.execute(
+                "SELECT key, vector FROM embeddings "
+                f"WHERE key IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+        if found:
+            now = time.time()
+            self._db.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+        return found
+
+    def _store(self, keys: Sequence[bytes], vectors: np.ndarray) -> Dict[bytes, List[float]]:
+        now = time.time()
+        rows = [(key, vector.tobytes(), now) for key, vector in zip(keys, vectors)]
+        self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+            rows,
+        )
+        self._size += sum(len(blob) for _, blob, _ in rows)
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+        # Return the float32 values, exactly what a later hit returns
+        return dict(zip(keys, vectors.tolist()))
+
+    def _evict(self) -> None:
+        # Trim to 90% of the budget so we don't evict on every insert
+        target = int(self.max_bytes * 0.9)
+
+        rows = self._db.execute(
+            "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        ).fetchall()
+        self._size = sum(size for _, size in rows)
+
+        stale = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            stale.append((key,))
+            self._size -= size
+
+        self._db.executemany("DELETE FROM embeddings WHERE key = ?", stale)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        keys = [self._key(text) for text in texts]
+
+        with self._lock:
+            vectors = self._lookup(keys)
+
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in vectors:
+                    missing.setdefault(key, text)
+
+            hit_count = sum(key in vectors for key in keys)
+            self.hits += hit_count
+            self.misses += len(texts) - hit_count
+
+            if missing:
+                fresh = self.embeddings.embed_documents(list(missing.values()))
+                vectors.update(self._store(list(missing), np.asarray(fresh, dtype=np.float32)))
+
+            self._db.commit()
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key("query\0" + text)
+
+        with self._lock:
+            cached = self._lookup([key])
+            if key in cached:
+                self.hits += 1
+                self._db.commit()
+                return cached[key]
+
+            self.misses += 1
+            vector = self.embeddings.embed_query(text)
+            stored = self._store([key], np.asarray([vector], dtype=np.float32))
+            self._db.commit()
+
+        return stored[key]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": self._size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,92 @@
+"""
+embedding_engine.py
+
+Responsibility:
+- CPU-friendly sentence-transformers Embeddings for ingestion
+- Configurable batch size and length-sorted batching (less padding)
+- Optional multi-process pool that encodes across cores
+"""
+
+from __future__ import annotations
+
+import atexit
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    Batched sentence-transformers encoder.
+
+    Texts are sorted by length across the whole call before they are
+    cut into ``batch_size`` batches, so each batch pads to a similar
+    length; results are returned in input order. With ``workers > 1``
+    a pool of encoder processes is started once and reused for every
+    call with at least ``pool_min_texts`` texts (smaller calls, such as
+    queries, stay in-process). Set OMP_NUM_THREADS / torch threads so
+    that workers x threads does not exceed the cores.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        batch_size: int = 64,
+        workers: int = 1,
+        device: str = "cpu",
+        normalize_embeddings: bool = False,
+        pool_min_texts: int = 256,
+    ):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.workers = workers
+        self.device = device
+        self.normalize_embeddings = normalize_embeddings
+        self.pool_min_texts = pool_min_texts
+
+        self.model = SentenceTransformer(model_name, device=device)
+        self._pool: Optional[dict] = None
+
+    def _get_pool(self) -> dict:
+        if self._pool is None:
+            self._pool = self.model.start_multi_process_pool([self.device] * self.workers)
+            atexit.register(self.close)
+        return self._pool
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        use_pool = self.workers > 1 and len(texts) >= self.pool_min_texts
+
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            pool=self._get_pool() if use_pool else None,
+            # One length-homogeneous slice per worker batch
+            chunk_size=self.batch_size * 4 if use_pool else None,
+            normalize_embeddings=self.normalize_embeddings,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        # Longest first (like sentence-transformers does per call), but
+        # over the whole input so pool slices are length-homogeneous too
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        vectors = self._encode([texts[i] for i in order])
+
+        restored = np.empty_like(vectors)
+        restored[order] = vectors
+        return restored.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
@@ -0,0 +1,118 @@
+"""
+json_stream.py
+
+Responsibility:
+- Read one array out of a large top-level JSON object incrementally
+- Yield its items one at a time with bounded memory (stdlib only)
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, TextIO, Union
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+
+        # Drop consumed text so the buffer stays around one item in size
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            # A number cut at the buffer edge decodes "successfully"
+            if end == len(self.buf) and self._fill():
+                continue
+
+            self.pos = end
+            return obj
+
+
+def iter_json_array(
+    source: Union[str, Path, TextIO],
+    key: str = "blocks",
+    chunk_size: int = 64 * 1024,
+) -> Iterator[Any]:
+    """
+    Yield the items of ``obj[key]`` from a JSON object, one at a time.
+
+    Only the current item (plus one read chunk) is held in memory.
+    Other top-level values are parsed and discarded. Yields nothing if
+    the key is missing.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8") as f:
+            yield from iter_json_array(f, key=key, chunk_size=chunk_size)
+        return
+
+    reader = _Reader(source, chunk_size)
+    reader.expect("{")
+
+    if reader.peek() == "}":
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(":")
+
+        if name != key:
+            reader.value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+
+            while True:
+                yield reader.value()
+                if reader.peek() == "]":
+                    return
+                reader.expect(",")
+
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
@@ -0,0 +1,550 @@
+"""
+mmap_store.py
+
+Responsibility:
+- In-process VectorStore on a memory-mapped vector matrix
+- Exact NumPy top-k for small collections, HNSW (hnswlib) for large ones
+- Append-only record log with tombstones, metadata filters, compaction
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from docsvision.core.quantization import CompressedEmbeddings, VectorCodec
+
+VECTORS_FILE = "vectors.npy"
+NORMS_FILE = "norms.npy"
+RECORDS_FILE = "records.jsonl"
+HNSW_FILE = "hnsw.bin"
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def matches_filter(metadata: dict, where: Optional[dict]) -> bool:
+    """
+    Chroma-style metadata filter: {"key": value}, {"key": {"$in": [...]}},
+    comparison operators, "$and" / "$or".
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, c) for c in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, c) for c in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op not in _COMPARISONS:
+                    raise ValueError(f"Unsupported filter operator '{op}'")
+                if not _COMPARISONS[op](value, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+
+    return True
+
+
+class MmapVectorStore(VectorStore):
+    """
+    Vectors live in a growable .npy matrix opened with np.memmap (plus
+    a float32 norm per row); texts, metadata and deletions are appended
+    to a JSONL log that is replayed on open. Every add and delete is on
+    disk when the call returns.
+
+    Search is cosine similarity. Below ``hnsw_threshold`` live rows it
+    is an exact blocked matrix-vector product with argpartition top-k;
+    above it an hnswlib graph is built (and saved) once and updated
+    incrementally, falling back to exact search if hnswlib is missing.
+
+    With CompressedEmbeddings the rows are stored in the codec's dtype
+    (float16 / int8 codes), so the matrix really is 2x / 4x smaller.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        persist_directory: str = "storage/vectors",
+        collection_name: str = "docsvision",
+        hnsw_threshold: int = 10_000,
+        hnsw_m: int = 16,
+        hnsw_ef: int = 100,
+        block_rows: int = 8192,
+    ):
+        self._embedding = embedding
+        self.path = Path(persist_directory) / f"{collection_name}.mmap"
+        self._recover()
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.hnsw_threshold = hnsw_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef = hnsw_ef
+        self.block_rows = block_rows
+
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._alive: List[bool] = []
+        self._row_of: Dict[str, int] = {}
+
+        self._vectors: Optional[np.memmap] = None
+        self._norms: Optional[np.memmap] = None
+        self._hnsw = None
+        self._live_mask: Optional[np.ndarray] = None
+
+        self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def _codec(self) -> Optional[VectorCodec]:
+        # Read on every use: an unfitted codec may fall back to float32
+        if isinstance(self._embedding, CompressedEmbeddings):
+            return self._embedding.codec
+        return None
+
+    # ---------------- Storage ----------------
+
+    @property
+    def _rows(self) -> int:
+        return len(self._ids)
+
+    @property
+    def _compacting(self) -> Path:
+        return self.path.with_name(self.path.name + ".compact")
+
+    @property
+    def _previous(self) -> Path:
+        return self.path.with_name(self.path.name + ".old")
+
+    def _recover(self) -> None:
+        # A compaction interrupted between its two renames leaves only
+        # the previous directory; an earlier one leaves a partial copy
+        if not self.path.exists() and self._previous.exists():
+            os.replace(self._previous, self.path)
+        shutil.rmtree(self._compacting, ignore_errors=True)
+        shutil.rmtree(self._previous, ignore_errors=True)
+
+    def _load(self) -> None:
+        records = self.path / RECORDS_FILE
+        if records.exists():
+            with records.open("r", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if "delete" in record:
+                        row = self._row_of.pop(record["delete"], None)
+                        if row is not None:
+                            self._alive[row] = False
+                        continue
+                    if "update" in record:
+                        row = self._row_of.get(record["update"])
+                        if row is not None:
+                            self._metadatas[row] = record["metadata"]
+                        continue
+
+                    self._row_of[record["id"]] = len(self._ids)
+                    self._ids.append(record["id"])
+                    self._texts.append(record["text"])
+                    self._metadatas.append(record["metadata"])
+                    self._alive.append(True)
+
+        if (self.path / VECTORS_FILE).exists():
+            self._vectors = np.load(self.path / VECTORS_FILE, mmap_mode="r+")
+            self._norms = np.load(self.path / NORMS_FILE, mmap_mode="r+")
+
+    def _reserve(self, rows: int, dim: int, dtype: np.dtype) -> None:
+        """
+        Make room for ``rows`` rows, doubling the capacity (the files
+        are rewritten only when they grow).
+        """
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if rows <= capacity:
+            return
+
+        new_capacity = max(rows, 2 * capacity, 1024)
+        for name, shape, kind, old in (
+            (VECTORS_FILE, (new_capacity, dim), dtype, self._vectors),
+            (NORMS_FILE, (new_capacity,), np.float32, self._norms),
+        ):
+            tmp = self.path / f"{name}.tmp"
+            grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=kind, shape=shape)
+            if old is not None:
+                grown[:capacity] = old
+            grown.flush()
+            del grown
+            os.replace(tmp, self.path / name)
+
+        self._vectors = np.load(self.path / VECTORS_FILE, mmap_mode="r+")
+        self._norms = np.load(self.path / NORMS_FILE, mmap_mode="r+")
+
+    def _append_records(self, records: Iterable[dict]) -> None:
+        with (self.path / RECORDS_FILE).open("a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _to_storage(self, vectors: np.ndarray) -> np.ndarray:
+        # Embeddings of a compressed store are already decoded codec
+        # values, so re-encoding them is exact
+        if self._codec is None or self._codec.dtype == "float32":
+            return vectors
+        if self._codec.dtype == "int8":
+            return np.clip(np.rint(vectors / self._codec.scale), -127, 127).astype(np.int8)
+        return vectors.astype(self._codec.dtype)
+
+    # ---------------- Writes ----------------
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+
+        # Copies, so callers mutating their Documents do not change the store
+        metadatas = [dict(m) for m in metadatas] if metadatas else [{} for _ in texts]
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+
+        # Re-adding an id replaces it
+        self.delete([i for i in ids if i in self._row_of])
+
+        vectors = np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        stored = self._to_storage(vectors)
+
+        start = self._rows
+        self._reserve(start + len(texts), vectors.shape[1], stored.dtype)
+        self._vectors[start:start + len(texts)] = stored
+        self._norms[start:start + len(texts)] = np.linalg.norm(vectors, axis=1)
+        self._vectors.flush()
+        self._norms.flush()
+
+        self._append_records(
+            {"id": i, "text": t, "metadata": m}
+            for i, t, m in zip(ids, texts, metadatas)
+        )
+        for offset, (i, t, m) in enumerate(zip(ids, texts, metadatas)):
+            self._row_of[i] = start + offset
+            self._ids.append(i)
+            self._texts.append(t)
+            self._metadatas.append(m)
+            self._alive.append(True)
+
+        self._live_mask = None
+        if self._hnsw is not None:
+            self._hnsw.resize_index(max(self._rows, self._hnsw.get_max_elements()))
+            self._hnsw.add_items(vectors, np.arange(start, self._rows))
+
+        return ids
+
+    def update_metadatas(self, ids: List[str], metadatas: List[dict]) -> None:
+        """
+        Replace the metadata of stored rows (vectors are untouched).
+        """
+        updates = [(i, m) for i, m in zip(ids, metadatas) if i in self._row_of]
+        self._append_records({"update": i, "metadata": m} for i, m in updates)
+        for i, metadata in updates:
+            self._metadatas[self._row_of[i]] = dict(metadata)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """
+        Tombstone ``ids``; the rows are reclaimed by compact().
+        """
+        ids = [i for i in (ids or []) if i in self._row_of]
+        if not ids:
+            return True
+
+        self._append_records({"delete": i} for i in ids)
+        self._live_mask = None
+        for i in ids:
+            row = self._row_of.pop(i)
+            self._alive[row] = False
+            if self._hnsw is not None:
+                self._hnsw.mark_deleted(row)
+        return True
+
+    def compact(self) -> None:
+        """
+        Rewrite the matrix and the log without deleted rows.
+
+        The compacted files are written to a sibling directory that
+        then replaces the store with two renames, so an interrupted
+        compaction leaves the previous files intact (recovered on open).
+        """
+        live = np.flatnonzero(self._alive)
+        if len(live) == self._rows:
+            return
+
+        tmp = self._compacting
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        records = [
+            {"id": self._ids[r], "text": self._texts[r], "metadata": self._metadatas[r]}
+            for r in live
+        ]
+        with (tmp / RECORDS_FILE).open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if self._vectors is not None and len(live):
+            for name, old in ((VECTORS_FILE, self._vectors), (NORMS_FILE, self._norms)):
+                compacted = np.lib.format.open_memmap(
+                    tmp / name, mode="w+", dtype=old.dtype, shape=(len(live),) + old.shape[1:]
+                )
+                for start in range(0, len(live), self.block_rows):
+                    rows = live[start:start + self.block_rows]
+                    compacted[start:start + len(rows)] = old[rows]
+                compacted.flush()
+                del compacted
+
+        # Release the old memory maps before their directory is moved
+        self._vectors = self._norms = self._hnsw = self._live_mask = None
+        os.replace(self.path, self._previous)
+        os.replace(tmp, self.path)
+        shutil.rmtree(self._previous)
+
+        self._ids, self._texts, self._metadatas, self._alive = [], [], [], []
+        self._row_of = {}
+        self._load()
+
+    def persist(self) -> None:
+        """
+        Writes are already durable; compact when most rows are dead
+        and save the HNSW graph.
+        """
+        if self._alive.count(False) > len(self._row_of):
+            self.compact()
+        if self._hnsw is not None:
+            self._hnsw.save_index(str(self.path / HNSW_FILE))
+
+    # ---------------- Reads ----------------
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[dict] = None,
+        limit: Optional[int] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, list]:
+        """
+        Chroma-compatible subset of Collection.get().
+        """
+        include = ["documents", "metadatas"] if include is None else include
+
+        rows = (
+            [self._row_of[i] for i in ids if i in self._row_of]
+            if ids is not None
+            else [r for r in range(self._rows) if self._alive[r]]
+        )
+        rows = [r for r in rows if matches_filter(self._metadatas[r], where)][:limit]
+
+        result = {"ids": [self._ids[r] for r in rows]}
+        if "documents" in include:
+            result["documents"] = [self._texts[r] for r in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [dict(self._metadatas[r]) for r in rows]
+        return result
+
+    def get_by_ids(self, ids: List[str], /) -> List[Document]:
+        return [
+            self._document(self._row_of[i]) for i in ids if i in self._row_of
+        ]
+
+    def count(self) -> int:
+        return len(self._row_of)
+
+    def _document(self, row: int) -> Document:
+        return Document(
+            id=self._ids[row],
+            page_content=self._texts[row],
+            metadata=dict(self._metadatas[row]),
+        )
+
+    def _mask(self, where: Optional[dict]) -> np.ndarray:
+        if self._live_mask is None:
+            self._live_mask = np.array(self._alive, dtype=bool)
+        if not where:
+            return self._live_mask
+
+        return self._live_mask & np.fromiter(
+            (matches_filter(m, where) for m in self._metadatas),
+            dtype=bool,
+            count=self._rows,
+        )
+
+    def _exact(self, query: np.ndarray, k: int, mask: np.ndarray) -> List[Tuple[int, float]]:
+        rows = self._rows
+        scores = np.empty(rows, dtype=np.float32)
+
+        # int8 codes: fold the per-dimension scale into the query
+        q = query * self._codec.scale if self._codec is not None and self._codec.dtype == "int8" else query
+        for start in range(0, rows, self.block_rows):
+            block = self._vectors[start:min(start + self.block_rows, rows)]
+            if block.dtype != np.float32:
+                block = block.astype(np.float32)
+            scores[start:start + len(block)] = block @ q
+
+        scores /= self._norms[:rows] * np.linalg.norm(query) + 1e-12
+        scores[~mask] = -np.inf
+
+        k = min(k, int(mask.sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(r), float(scores[r])) for r in top]
+
+    def _get_hnsw(self):
+        if self._hnsw is not None:
+            return self._hnsw
+        if len(self._row_of) < self.hnsw_threshold:
+            return None
+
+        try:
+            import hnswlib
+        except ImportError:
+            return None
+
+        dim = self._vectors.shape[1]
+        dead = np.flatnonzero(~self._mask(None))
+        saved = self.path / HNSW_FILE
+
+        index = None
+        if saved.exists():
+            index = hnswlib.Index(space="cosine", dim=dim)
+            index.load_index(str(saved), max_elements=self._rows)
+            if index.get_current_count() != self._rows:
+                index = None
+
+        if index is None:
+            index = hnswlib.Index(space="cosine", dim=dim)
+            index.init_index(max_elements=self._rows, ef_construction=200, M=self.hnsw_m)
+            for start in range(0, self._rows, self.block_rows):
+                stop = min(start + self.block_rows, self._rows)
+                block = np.asarray(self._vectors[start:stop], dtype=np.float32)
+                if self._codec is not None and self._codec.dtype == "int8":
+                    block = block * self._codec.scale
+                index.add_items(block, np.arange(start, stop))
+
+        # Deletions since the graph was last saved
+        for row in dead:
+            try:
+                index.mark_deleted(int(row))
+            except RuntimeError:
+                pass
+        index.save_index(str(saved))
+
+        index.set_ef(self.hnsw_ef)
+        self._hnsw = index
+        return index
+
+    def _search(self, query: np.ndarray, k: int, where: Optional[dict]) -> List[Tuple[int, float]]:
+        if self._vectors is None or not self._row_of:
+            return []
+
+        index = self._get_hnsw()
+        if index is None:
+            return self._exact(query, k, self._mask(where))
+
+        live = len(self._row_of)
+        allowed = None
+        if where:
+            mask = self._mask(where)
+            live = int(mask.sum())
+            allowed = lambda row: bool(mask[row])  # noqa: E731
+        k = min(k, live)
+        if k == 0:
+            return []
+
+        index.set_ef(max(self.hnsw_ef, k))
+        try:
+            labels, distances = index.knn_query(query, k=k, filter=allowed)
+        except RuntimeError:
+            # A selective filter can leave fewer than k reachable rows
+            return self._exact(query, k, self._mask(where))
+        return [(int(r), 1.0 - float(d)) for r, d in zip(labels[0], distances[0])]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[Tuple[Document, float]]:
+        query = np.asarray(embedding, dtype=np.float32)
+        return [(self._document(r), s) for r, s in self._search(query, k, filter)]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [d for d, _ in self.similarity_search_by_vector_with_score(embedding, k, filter)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self._embedding.embed_query(query), k, filter
+        )
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [d for d, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Cosine similarity in [-1, 1] -> relevance in [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "MmapVectorStore":
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
@@ -0,0 +1,162 @@
+"""
+onnx_embeddings.py
+
+Responsibility:
+- Export a sentence-transformers model to ONNX and quantize it to int8
+- Run it with onnxruntime + tokenizers (no torch at query time)
+- Reproduce the sentence-transformers pipeline: mean pooling + L2 norm
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def default_onnx_dir(model_name: str) -> Path:
+    return Path("storage/onnx") / model_name.replace("/", "__")
+
+
+def export_onnx_model(
+    model_name: str,
+    output_dir: Optional[str | Path] = None,
+    quantize: bool = True,
+    opset: int = 17,
+) -> Path:
+    """
+    Export the transformer of ``model_name`` to ONNX and (by default)
+    write a dynamically int8-quantized copy next to it.
+
+    Needs torch and transformers (install-time only); the result is
+    loaded by OnnxEmbeddings without either.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    output_dir = Path(output_dir or default_onnx_dir(model_name))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    model = AutoModel.from_pretrained(model_name).eval()
+    tokenizer.backend_tokenizer.save(str(output_dir / TOKENIZER_FILE))
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(output_dir / MODEL_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False,
+        )
+
+    if quantize:
+        quantize_dynamic(
+            str(output_dir / MODEL_FILE),
+            str(output_dir / QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+
+    return output_dir
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Embeddings from an exported (int8) ONNX model on onnxruntime.
+
+    Matches sentence-transformers models whose pipeline is
+    Transformer -> mean Pooling -> Normalize (e.g. all-MiniLM-L6-v2).
+    Texts are length-sorted before batching, as in the torch engine.
+    """
+
+    def __init__(
+        self,
+        model_dir: str | Path,
+        quantized: bool = True,
+        batch_size: int = 64,
+        max_length: int = 256,
+        normalize_embeddings: bool = True,
+        threads: Optional[int] = None,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_dir = Path(model_dir)
+        model_path = self.model_dir / (QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"{model_path} not found. Export it first: "
+                "python scripts/export_onnx.py <model_name>"
+            )
+
+        self.batch_size = batch_size
+        self.normalize_embeddings = normalize_embeddings
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        if self.tokenizer.padding is None:
+            self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads or os.cpu_count() or 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        (hidden,) = self.session.run(["last_hidden_state"], feeds)
+
+        # Mean pooling over real (unpadded) tokens
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize_embeddings:
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            pooled = pooled / np.clip(norms, 1e-12, None)
+
+        return pooled
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        vectors = np.concatenate([
+            self._encode_batch([texts[i] for i in order[start:start + self.batch_size]])
+            for start in range(0, len(texts), self.batch_size)
+        ])
+
+        restored = np.empty_like(vectors)
+        restored[order] = vectors
+        return restored.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode_batch([text])[0].tolist()
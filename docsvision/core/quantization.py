@@ -0,0 +1,241 @@
+"""
+quantization.py
+
+Responsibility:
+- Reduced-dimension (PCA / Matryoshka truncation) and reduced-precision
+  (float16 / int8 scalar) vector codecs
+- Embeddings wrapper that hands the compressed vectors to a vector store
+- Persist fitted codec parameters next to the collection
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+DTYPES = ("float32", "float16", "int8")
+METHODS = ("pca", "matryoshka")
+
+_SPEC = re.compile(r"^(?:(?P<method>pca|matryoshka)(?P<dim>\d+)-)?(?P<dtype>float32|float16|int8)$")
+
+
+class VectorCodec:
+    """
+    Optional dimension reduction followed by scalar quantization.
+
+    ``dim`` keeps the first ``dim`` PCA components (fitted on a sample)
+    or the first ``dim`` coordinates (Matryoshka truncation, then
+    re-normalized; only meaningful for Matryoshka-trained models).
+    ``dtype`` is the storage precision; int8 uses a symmetric
+    per-dimension scale fitted on the same sample.
+    """
+
+    def __init__(
+        self,
+        dtype: str = "float32",
+        dim: Optional[int] = None,
+        method: str = "pca",
+    ):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype '{dtype}'. Choose from: {', '.join(DTYPES)}")
+        if method not in METHODS:
+            raise ValueError(f"Unknown method '{method}'. Choose from: {', '.join(METHODS)}")
+
+        self.dtype = dtype
+        self.dim = dim
+        self.method = method
+
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "VectorCodec":
+        """
+        Parse "int8", "float16", "pca128-int8", "matryoshka256-float16", ...
+        """
+        match = _SPEC.match(spec)
+        if match is None:
+            raise ValueError(f"Invalid vector compression spec '{spec}'")
+
+        dim = match["dim"]
+        return cls(
+            dtype=match["dtype"],
+            dim=int(dim) if dim else None,
+            method=match["method"] or "pca",
+        )
+
+    @property
+    def spec(self) -> str:
+        if self.dim is None:
+            return self.dtype
+        return f"{self.method}{self.dim}-{self.dtype}"
+
+    @property
+    def needs_fit(self) -> bool:
+        return (
+            (self.dim is not None and self.method == "pca" and self.components is None)
+            or (self.dtype == "int8" and self.scale is None)
+        )
+
+    def bytes_per_vector(self, input_dim: int) -> int:
+        return (self.dim or input_dim) * np.dtype(self.dtype).itemsize
+
+    # ---------------- Fitting ----------------
+
+    def fit(self, vectors: np.ndarray) -> "VectorCodec":
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        if self.dim is not None and self.method == "pca":
+            self.mean = vectors.mean(axis=0)
+            _, _, vt = np.linalg.svd(vectors - self.mean, full_matrices=False)
+
+            # A sample smaller than dim spans fewer directions; the
+            # missing components stay zero
+            self.components = np.zeros((self.dim, vectors.shape[1]), dtype=np.float32)
+            rank = min(self.dim, len(vt))
+            self.components[:rank] = vt[:rank]
+
+        if self.dtype == "int8":
+            reduced = self.reduce(vectors)
+            self.scale = np.maximum(np.abs(reduced).max(axis=0), 1e-12) / 127.0
+
+        return self
+
+    # ---------------- Transform ----------------
+
+    def reduce(self, vectors: np.ndarray) -> np.ndarray:
+        """Dimension reduction only (float32)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            return vectors
+
+        if self.method == "pca":
+            return (vectors - self.mean) @ self.components.T
+
+        truncated = vectors[:, :self.dim]
+        norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+        return truncated / np.clip(norms, 1e-12, None)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Reduce and quantize to the storage dtype."""
+        reduced = self.reduce(vectors)
+        if self.dtype == "int8":
+            return np.clip(np.rint(reduced / self.scale), -127, 127).astype(np.int8)
+        return reduced.astype(self.dtype)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Back to float32 in the reduced space."""
+        if self.dtype == "int8":
+            return codes.astype(np.float32) * self.scale
+        return codes.astype(np.float32)
+
+    # ---------------- Persistence ----------------
+
+    def save(self, path: str | Path) -> None:
+        arrays = {
+            name: value
+            for name, value in (
+                ("mean", self.mean),
+                ("components", self.components),
+                ("scale", self.scale),
+            )
+            if value is not None
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            np.savez(f, spec=np.array(self.spec), **arrays)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "VectorCodec":
+        with np.load(path) as data:
+            codec = cls.from_spec(str(data["spec"]))
+            codec.mean = data["mean"] if "mean" in data else None
+            codec.components = data["components"] if "components" in data else None
+            codec.scale = data["scale"] if "scale" in data else None
+        return codec
+
+
+class CompressedEmbeddings(Embeddings):
+    """
+    Embeddings as a compressed vector store sees them.
+
+    Documents are reduced and quantized, then decoded back to float32
+    (what the store indexes); queries are only reduced, so query
+    precision is not thrown away. The codec is fitted on a corpus
+    sample of at least ``min_fit_vectors`` vectors, either explicitly
+    with ``fit`` or on the first batch of documents if that batch is
+    large enough, and saved to ``codec_path`` so later sessions
+    transform queries identically. PCA and int8 scales fitted on a
+    handful of vectors do not generalize, so a collection whose sample
+    is smaller is stored uncompressed instead (a "float32" codec is
+    saved in place of the requested one).
+
+    ``embeddings`` (the full-precision model) is kept for rescoring.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        codec: VectorCodec,
+        codec_path: Optional[str | Path] = None,
+        min_fit_vectors: int = 256,
+    ):
+        self.embeddings = embeddings
+        self.codec_path = Path(codec_path) if codec_path else None
+        self.min_fit_vectors = min_fit_vectors
+
+        if self.codec_path is not None and self.codec_path.exists():
+            saved = VectorCodec.load(self.codec_path)
+            # "float32": the collection was too small to compress
+            if saved.spec not in (codec.spec, "float32"):
+                raise ValueError(
+                    f"Collection was built with '{saved.spec}', not '{codec.spec}'"
+                )
+            codec = saved
+        self.codec = codec
+
+    def _fit(self, vectors: np.ndarray) -> None:
+        if len(vectors) < self.min_fit_vectors:
+            self.codec = VectorCodec("float32")
+        else:
+            self.codec.fit(vectors)
+
+        if self.codec_path is not None:
+            self.codec.save(self.codec_path)
+
+    def fit(self, texts: List[str]) -> "CompressedEmbeddings":
+        """
+        Fit the codec on a sample of corpus texts; with fewer than
+        ``min_fit_vectors`` texts the collection stays uncompressed.
+        The full-precision vectors are cached by the wrapped
+        embeddings, so the sample is not embedded twice.
+        """
+        self._fit(np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32))
+        return self
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+
+        if self.codec.needs_fit:
+            self._fit(vectors)
+
+        return self.codec.decode(self.codec.encode(vectors)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = np.asarray([self.embeddings.embed_query(text)], dtype=np.float32)
+
+        # Nothing was added yet (adding fits the codec), so the store is
+        # empty and any query vector finds no results
+        if self.codec.needs_fit:
+            return vector[0].tolist()
+
+        return self.codec.reduce(vector)[0].tolist()
@@ -3,12 +3,60 @@ retriever.py
 
 Responsibility:
 - Retrieve relevant document chunks from vector store
+- Rescore candidates from compressed stores with full-precision vectors
 """
 
 from typing import List
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
 from langchain_core.vectorstores import VectorStore
 
+from docsvision.core.quantization import CompressedEmbeddings
+
+
+class RescoringRetriever(BaseRetriever):
+    """
+    Fetch ``candidates`` chunks from a compressed (reduced / quantized)
+    store, then re-rank them by cosine similarity of full-precision
+    embeddings and keep the top ``k``.
+
+    The full vectors of indexed chunks come from the embedding cache,
+    so rescoring does not re-run the model for them.
+    """
+
+    vectorstore: VectorStore
+    embeddings: Embeddings
+    k: int = 5
+    candidates: int = 20
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        docs = self.vectorstore.similarity_search(query, k=max(self.candidates, self.k))
+        if len(docs) <= 1:
+            return docs
+
+        query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        doc_vectors = np.asarray(
+            self.embeddings.embed_documents([d.page_content for d in docs]),
+            dtype=np.float32,
+        )
+
+        scores = doc_vectors @ query_vector
+        scores /= np.linalg.norm(doc_vectors, axis=1) * np.linalg.norm(query_vector) + 1e-12
+
+        order = np.argsort(-scores, kind="stable")[:self.k]
+        return [docs[i] for i in order]
+
 
 class DocsVisionRetriever:
     def __init__(
@@ -21,10 +69,20 @@ class DocsVisionRetriever:
         self.k = k
         self.search_type = search_type
 
-        self.retriever = vectorstore.as_retriever(
-            search_type=search_type,
-            search_kwargs={"k": k},
-        )
+        embeddings = getattr(vectorstore, "embeddings", None)
+        if isinstance(embeddings, CompressedEmbeddings):
+            # Compressed store: over-fetch, then rescore at full precision
+            self.retriever = RescoringRetriever(
+                vectorstore=vectorstore,
+                embeddings=embeddings.embeddings,
+                k=k,
+                candidates=4 * k,
+            )
+        else:
+            self.retriever = vectorstore.as_retriever(
+                search_type=search_type,
+                search_kwargs={"k": k},
+            )
 
     def retrieve(self, query: str) -> List[Document]:
         """
@@ -2,57 +2,444 @@
 vectordb.py
 
 Responsibility:
-- Create / load ChromaDB vector store
+- Create / load the vector store (ChromaDB or the in-process mmap store)
+- Idempotent upserts with deterministic chunk ids
+- Per-document collections keyed by file hash
 - Ensure persistence
 """
 
-from typing import List
+import hashlib
+import os
+import shutil
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from itertools import batched, chain, islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import chromadb
+from chromadb.config import Settings
+from chromadb.errors import NotFoundError
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from docsvision.core.mmap_store import MmapVectorStore
+from docsvision.core.quantization import CompressedEmbeddings, VectorCodec
+from docsvision.document_model import DocumentModel
+from docsvision.document_model.columnar import SUFFIX as COLUMNAR_SUFFIX
+
+VECTOR_BACKENDS = ("chroma", "mmap")
 
 
 def get_vectorstore(
-    documents: List[Document],
+    documents: Iterable[Document],
     embedding: Embeddings,
     persist_directory: str = "storage/chroma",
     collection_name: str = "docsvision",
-) -> Chroma:
+    batch_size: int = 512,
+    compression: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> VectorStore:
     """
-    Create or load a Chroma vector store.
+    Create or load a vector store.
 
     Args:
-        documents: Chunked LangChain Documents
+        documents: Chunked LangChain Documents (a list or a generator)
         embedding: Embedding function
         persist_directory: Directory for persistence
-        collection_name: Chroma collection name
+        collection_name: Collection name
+        batch_size: Chunks embedded and written per add_documents call
+            (large enough for length sorting and the embedding pool)
+        compression: Vector codec spec, see load_vectorstore
+        backend: "chroma" or "mmap", see load_vectorstore
 
     Returns:
-        Chroma vector store
+        Chroma or MmapVectorStore
     """
 
-    vectordb = Chroma.from_documents(
-        documents=documents,
+    vectordb = load_vectorstore(
         embedding=embedding,
         persist_directory=persist_directory,
         collection_name=collection_name,
+        compression=compression,
+        backend=backend,
     )
 
+    # Only new or changed chunks are embedded; re-ingesting a source
+    # replaces its previous chunks instead of duplicating them
+    upsert_documents(vectordb, documents, batch_size=batch_size)
+
     vectordb.persist()
     return vectordb
 
 
+@dataclass
+class UpsertStats:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def _doc_id(document: Document) -> str:
+    # Chunks without a doc_id (e.g. built outside the chunker) are
+    # keyed by their source
+    metadata = document.metadata
+    return metadata.setdefault("doc_id", str(metadata.get("source", "")))
+
+
+def chunk_id(document: Document) -> str:
+    """
+    Deterministic id from the document id, page and content hash.
+    """
+    h = hashlib.sha256()
+    h.update(_doc_id(document).encode("utf-8"))
+    h.update(b"\0")
+    h.update(str(document.metadata.get("page", "")).encode("utf-8"))
+    h.update(b"\0")
+    h.update(document.page_content.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _existing_ids(vectordb: VectorStore, doc_id: str, pages: Optional[List[int]]) -> set:
+    if pages is not None and not pages:
+        return set()
+
+    where = {"doc_id": doc_id}
+    if pages is not None:
+        where = {"$and": [where, {"page": {"$in": pages}}]}
+
+    existing = vectordb.get(where=where, include=[])
+    return set(existing.get("ids", [])) if existing else set()
+
+
+def _update_metadatas(vectordb: VectorStore, ids: List[str], metadatas: List[dict]) -> None:
+    if isinstance(vectordb, MmapVectorStore):
+        vectordb.update_metadatas(ids, metadatas)
+    else:
+        vectordb._collection.update(ids=ids, metadatas=metadatas)
+
+
+def _refresh_metadatas(
+    vectordb: VectorStore,
+    metadatas: Dict[str, dict],
+    batch_size: int,
+) -> int:
+    """
+    Rewrite stored metadata that differs from ``metadatas`` (id ->
+    metadata); returns how many chunks were updated.
+    """
+    updated = 0
+    for batch in batched(metadatas, batch_size):
+        stored = vectordb.get(ids=list(batch), include=["metadatas"])
+        changed = [
+            (i, metadatas[i])
+            for i, metadata in zip(stored["ids"], stored["metadatas"])
+            if metadata != metadatas[i]
+        ]
+        if changed:
+            _update_metadatas(vectordb, [i for i, _ in changed], [m for _, m in changed])
+        updated += len(changed)
+    return updated
+
+
+def upsert_documents(
+    vectordb: VectorStore,
+    documents: Iterable[Document],
+    batch_size: int = 512,
+    pages: Optional[Iterable[int]] = None,
+    doc_ids: Iterable[str] = (),
+) -> UpsertStats:
+    """
+    Make the store hold exactly ``documents`` for each of their files.
+
+    Chunks are grouped by their ``doc_id`` metadata (the file identity;
+    defaults to ``source``). ``documents`` is consumed as a stream: new
+    chunks are embedded and added ``batch_size`` at a time, chunks
+    whose id already exists are not re-embedded. Once the stream ends,
+    chunks of the same file that were not produced are deleted, and
+    metadata that changed is rewritten in place: stored chunks whose
+    metadata differs, and chunks whose metadata grew after they were
+    added (the merged ``pages`` of a streaming deduplicator). Only ids
+    and metadata dicts are kept for the whole stream, not texts.
+
+    With ``pages``, deletion is limited to those pages of the file
+    (incremental page updates); a page listed there with no incoming
+    chunks is cleared. ``doc_ids`` are reconciled even if no documents
+    arrive for them.
+    """
+    pages = sorted(pages) if pages is not None else None
+
+    existing: Dict[str, set] = {}
+    seen: Dict[str, Dict[str, dict]] = defaultdict(dict)
+
+    def stored_ids(doc_id: str) -> set:
+        if doc_id not in existing:
+            existing[doc_id] = _existing_ids(vectordb, doc_id, pages)
+        return existing[doc_id]
+
+    for doc_id in doc_ids:
+        stored_ids(doc_id)
+        seen[doc_id]
+
+    stats = UpsertStats()
+    for batch in batched(documents, batch_size):
+        new = []
+        for document in batch:
+            doc_id, i = _doc_id(document), chunk_id(document)
+            if i in seen[doc_id]:
+                continue
+            seen[doc_id][i] = document.metadata
+            if i not in stored_ids(doc_id):
+                new.append((i, document))
+
+        if new:
+            vectordb.add_documents(
+                [doc for _, doc in new],
+                ids=[i for i, _ in new],
+            )
+            stats.added += len(new)
+
+    for doc_id, metadatas in seen.items():
+        stored = stored_ids(doc_id)
+
+        stale = stored - metadatas.keys()
+        if stale:
+            vectordb.delete(ids=list(stale))
+        stats.removed += len(stale)
+
+        kept = {i: m for i, m in metadatas.items() if i in stored}
+        updated = _refresh_metadatas(vectordb, kept, batch_size)
+        stats.updated += updated
+        stats.unchanged += len(kept) - updated
+
+        _refresh_metadatas(
+            vectordb,
+            {i: m for i, m in metadatas.items() if i not in stored},
+            batch_size,
+        )
+
+    return stats
+
+
+def fit_compression(
+    vectordb: VectorStore,
+    documents: Iterable[Document],
+    sample_size: int = 2048,
+) -> Iterator[Document]:
+    """
+    Fit the codec of a compressed store that has none yet on the first
+    ``sample_size`` chunks of ``documents``, and return the chunks
+    (sample included) still to be upserted. A corpus smaller than the
+    codec's minimum fit sample is stored uncompressed.
+    """
+    embedding = getattr(vectordb, "embeddings", None)
+    documents = iter(documents)
+    if not isinstance(embedding, CompressedEmbeddings) or not embedding.codec.needs_fit:
+        return documents
+
+    sample = list(islice(documents, sample_size))
+    embedding.fit([document.page_content for document in sample])
+    return chain(sample, documents)
+
+
 def load_vectorstore(
     embedding: Embeddings,
     persist_directory: str = "storage/chroma",
     collection_name: str = "docsvision",
-) -> Chroma:
+    compression: Optional[str] = None,
+    client: Optional[chromadb.ClientAPI] = None,
+    backend: Optional[str] = None,
+) -> VectorStore:
     """
-    Load an existing Chroma vector store from disk.
+    Load an existing vector store from disk.
+
+    ``backend`` (default: $DOCSVISION_VECTOR_BACKEND or "chroma") picks
+    Chroma or MmapVectorStore, an in-process memory-mapped index kept in
+    <persist_directory>/<collection_name>.mmap (no client round trips).
+
+    ``client`` is a shared chromadb client; collections opened through
+    the same client share one connection and segment cache.
+
+    ``compression`` (default: $DOCSVISION_VECTOR_COMPRESSION) stores
+    reduced / quantized vectors, e.g. "pca128-int8" or
+    "matryoshka256-float16" (see quantization.VectorCodec). The fitted
+    codec is saved next to the collection. Chroma keeps float32 vectors
+    internally, so only the dimension reduction shrinks its index.
     """
+    if backend is None:
+        backend = os.environ.get("DOCSVISION_VECTOR_BACKEND", "chroma")
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(
+            f"Unknown vector backend '{backend}'. Choose from: {', '.join(VECTOR_BACKENDS)}"
+        )
+
+    compression = compression or os.environ.get("DOCSVISION_VECTOR_COMPRESSION")
+    if compression and compression != "float32":
+        embedding = CompressedEmbeddings(
+            embedding,
+            VectorCodec.from_spec(compression),
+            codec_path=Path(persist_directory) / f"{collection_name}.codec.npz",
+        )
+
+    if backend == "mmap":
+        return MmapVectorStore(
+            embedding,
+            persist_directory=persist_directory,
+            collection_name=collection_name,
+        )
 
     return Chroma(
         embedding_function=embedding,
         persist_directory=persist_directory,
         collection_name=collection_name,
+        client=client,
     )
+
+
+def collection_count(vectordb: VectorStore) -> int:
+    """
+    Number of chunks in the store, without fetching their ids.
+    """
+    if isinstance(vectordb, MmapVectorStore):
+        return vectordb.count()
+    return vectordb._collection.count()
+
+
+class DocumentCollections:
+    """
+    One collection per document, keyed by its file hash: a Chroma
+    collection in a shared persistent client, or one MmapVectorStore
+    directory per document with ``backend="mmap"`` (default:
+    $DOCSVISION_VECTOR_BACKEND or "chroma").
+
+    Dropping a document deletes its collection instead of listing and
+    deleting ids in a shared one, and a file that was indexed before is
+    reused as is, together with its document model (saved next to the
+    collection once indexing finished, so it is not OCRed again). At
+    most ``max_open`` collections are kept open (least recently used
+    first out); the Chroma client itself unloads segments past
+    ``memory_limit_bytes``.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        persist_directory: str = "storage/chroma",
+        max_open: int = 8,
+        memory_limit_bytes: int = 1 << 30,
+        compression: Optional[str] = None,
+        backend: Optional[str] = None,
+    ):
+        if backend is None:
+            backend = os.environ.get("DOCSVISION_VECTOR_BACKEND", "chroma")
+        if backend not in VECTOR_BACKENDS:
+            raise ValueError(
+                f"Unknown vector backend '{backend}'. Choose from: {', '.join(VECTOR_BACKENDS)}"
+            )
+
+        self.embedding = embedding
+        self.persist_directory = persist_directory
+        self.max_open = max_open
+        self.compression = compression
+        self.backend = backend
+
+        # The mmap backend has no client; each store is its own directory
+        self.client = None
+        if backend == "chroma":
+            self.client = chromadb.PersistentClient(
+                path=persist_directory,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    chroma_segment_cache_policy="LRU",
+                    chroma_memory_limit_bytes=memory_limit_bytes,
+                ),
+            )
+        self._open: "OrderedDict[str, VectorStore]" = OrderedDict()
+
+    @staticmethod
+    def collection_name(doc_hash: str) -> str:
+        return f"doc_{doc_hash[:48]}"
+
+    def _mmap_path(self, doc_hash: str) -> Path:
+        return Path(self.persist_directory) / f"{self.collection_name(doc_hash)}.mmap"
+
+    def _model_path(self, doc_hash: str) -> Path:
+        return Path(self.persist_directory) / f"{self.collection_name(doc_hash)}{COLUMNAR_SUFFIX}"
+
+    def save_model(self, doc_hash: str, doc_model: DocumentModel) -> None:
+        """
+        Store the document model next to the document's collection.
+        Call it once the document is fully indexed: the saved model is
+        what marks the collection as complete (see is_indexed).
+        """
+        path = self._model_path(doc_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        doc_model.save(path, source=doc_hash)
+
+    def load_model(self, doc_hash: str) -> Optional[DocumentModel]:
+        """
+        The stored document model, or None if it was never saved.
+        """
+        path = self._model_path(doc_hash)
+        return DocumentModel.load(path) if path.exists() else None
+
+    def is_indexed(self, doc_hash: str) -> bool:
+        """
+        True if the document has a non-empty collection and its saved
+        document model. An indexing run that died part way has no
+        saved model, so its collection is completed, not reused.
+        """
+        if not self._model_path(doc_hash).exists():
+            return False
+
+        if self.backend == "mmap":
+            if doc_hash not in self._open and not self._mmap_path(doc_hash).exists():
+                return False
+            return self.get(doc_hash).count() > 0
+
+        try:
+            collection = self.client.get_collection(self.collection_name(doc_hash))
+        except NotFoundError:
+            return False
+        return collection.count() > 0
+
+    def get(self, doc_hash: str) -> VectorStore:
+        """
+        Vector store of one document (created on first use).
+        """
+        vectordb = self._open.get(doc_hash)
+        if vectordb is not None:
+            self._open.move_to_end(doc_hash)
+            return vectordb
+
+        vectordb = load_vectorstore(
+            embedding=self.embedding,
+            persist_directory=self.persist_directory,
+            collection_name=self.collection_name(doc_hash),
+            compression=self.compression,
+            client=self.client,
+            backend=self.backend,
+        )
+        self._open[doc_hash] = vectordb
+        while len(self._open) > self.max_open:
+            self._open.popitem(last=False)
+        return vectordb
+
+    def drop(self, doc_hash: str) -> None:
+        """
+        Remove a document and all of its chunks.
+        """
+        self._open.pop(doc_hash, None)
+        name = self.collection_name(doc_hash)
+        if self.backend == "mmap":
+            shutil.rmtree(self._mmap_path(doc_hash), ignore_errors=True)
+        else:
+            try:
+                self.client.delete_collection(name)
+            except NotFoundError:
+                pass
+        (Path(self.persist_directory) / f"{name}.codec.npz").unlink(missing_ok=True)
+        self._model_path(doc_hash).unlink(missing_ok=True)
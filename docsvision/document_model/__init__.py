@@ -1,52 +1,21 @@
-from .blocks import normalize_ocr_output
-from .layout import classify_block_type
-
-
-from .blocks import normalize_ocr_output
+from .blocks import Block, normalize_ocr_output
 from .layout import classify_block_type
+from .model import DocumentModel, PageChangeSet
+from .page_structure import build_page_structure, update_page_structure
 
 
 def build_document_model(ocr_result):
     """
     Build a clean document model from OCR output.
 
-    Output contract:
+    Output contract (a read-only mapping, see DocumentModel):
     - blocks   : List[str]   (TEXT ONLY — no OCR metadata)
     - pages    : Dict[int, List[str]]
-    - sections : List[Dict]  (optional / future use)
+    - sections : List[Dict]  (computed lazily, only when accessed)
     """
 
     # 1️⃣ Normalize raw OCR output into structured blocks
     normalized_blocks = normalize_ocr_output(ocr_result)
 
-    # 2️⃣ Extract TEXT ONLY (🔥 this is the critical fix)
-    blocks = [b["text"] for b in normalized_blocks if b.get("text")]
-
-    # 3️⃣ Build page-wise structure (simple & safe)
-    pages = {}
-    for b in normalized_blocks:
-        page = b.get("page", 1)
-        text = b.get("text", "").strip()
-
-        if not text:
-            continue
-
-        if page not in pages:
-            pages[page] = []
-
-        pages[page].append(text)
-
-    # 4️⃣ Optional: classify layout (kept for future UI / logic)
-    # Currently not used downstream, but safe to compute
-    sections = classify_block_type(
-        [b["text"] for b in normalized_blocks if b.get("text")]
-    )
-
-    # 5️⃣ Final document model (🔥 CLEAN CONTRACT)
-    doc_model = {
-        "blocks": blocks,     # ✅ List[str]
-        "pages": pages,       # ✅ Dict[int, List[str]]
-        "sections": sections  # ✅ Optional metadata
-    }
-
-    return doc_model
+    # 2️⃣ Blocks + pages in one pass; sections deferred until used
+    return DocumentModel(normalized_blocks)
@@ -1,7 +1,38 @@
 from __future__ import annotations
 
-import uuid
-from typing import Dict, List
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class Block:
+    """
+    Compact normalized document block.
+
+    Slotted (no per-instance __dict__) and keyed by a deterministic
+    ``"<page>-<index>"`` id instead of a random UUID. Supports
+    ``block["text"]`` / ``block.get("page")`` so code written against
+    the old dict blocks keeps working.
+    """
+
+    id: str
+    text: str
+    bbox: Optional[List[int]]
+    page: int
+    confidence: float
+    block_type: str = "unknown"
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
 
 
 def _clean_text(text: str) -> str:
@@ -11,12 +42,13 @@ def _clean_text(text: str) -> str:
     """
     if not text:
         return ""
-    return " ".join(text.strip().split())
+    return " ".join(text.split())
 
 
 def normalize_ocr_output(
-    raw_ocr: List[Dict]
-) -> List[Dict]:
+    raw_ocr: List[Dict],
+    page_offset: int = 0,
+) -> List[Block]:
     """
     Convert raw OCR output into normalized document blocks.
 
@@ -24,28 +56,32 @@ def normalize_ocr_output(
     ----------
     raw_ocr : List[Dict]
         Raw OCR results from vision layer.
+    page_offset : int
+        Added to every page number (used when appending page batches).
 
     Returns
     -------
-    List[Dict]
-        Normalized document blocks.
+    List[Block]
+        Normalized document blocks with ids unique per document.
     """
-    normalized_blocks: List[Dict] = []
+    normalized_blocks: List[Block] = []
+    page_counts: Dict[int, int] = {}
 
     for item in raw_ocr:
         text = _clean_text(item.get("text", ""))
         if not text:
             continue  # skip empty OCR noise
 
-        block = {
-            "id": str(uuid.uuid4()),
-            "text": text,
-            "bbox": item.get("bbox"),
-            "page": item.get("page", 1),
-            "confidence": float(item.get("confidence", 0)) / 100.0,
-            "block_type": "unknown"
-        }
+        page = item.get("page", 1) + page_offset
+        index = page_counts.get(page, 0)
+        page_counts[page] = index + 1
 
-        normalized_blocks.append(block)
+        normalized_blocks.append(Block(
+            id=f"{page}-{index}",
+            text=text,
+            bbox=item.get("bbox"),
+            page=page,
+            confidence=float(item.get("confidence", 0)) / 100.0,
+        ))
 
     return normalized_blocks
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+_PREDICATES = ("isdigit", "isupper", "islower")
+
+# Character classes of the Latin-1 range, which covers most text
+_LATIN1 = {
+    name: np.array([getattr(chr(cp), name)() for cp in range(256)])
+    for name in _PREDICATES
+}
+
+
+class BlockFeatures:
+    """
+    Per-page feature arrays for a batch of blocks.
+
+    Every feature is computed on first access for the whole batch at
+    once, so a rule set only pays for the features it reads. Texts are
+    concatenated into one code-point array (no fixed-width string
+    array), and character classes are looked up only for the code
+    points that actually occur.
+    """
+
+    def __init__(self, texts: Sequence[str], bboxes: Optional[Sequence] = None):
+        self.texts = list(texts)
+        self._bboxes = bboxes
+
+    @cached_property
+    def length(self) -> np.ndarray:
+        return np.fromiter(map(len, self.texts), dtype=np.int64, count=len(self.texts))
+
+    @cached_property
+    def is_upper(self) -> np.ndarray:
+        """Same semantics as str.isupper()."""
+        return np.fromiter(map(str.isupper, self.texts), dtype=bool, count=len(self.texts))
+
+    @cached_property
+    def _code_points(self) -> np.ndarray:
+        return np.frombuffer("".join(self.texts).encode("utf-32-le"), dtype=np.uint32)
+
+    @cached_property
+    def _owner(self) -> np.ndarray:
+        # Block index of every code point
+        return np.repeat(np.arange(len(self.texts), dtype=np.int32), self.length)
+
+    @cached_property
+    def _latin1(self) -> np.ndarray:
+        return self._code_points < 256
+
+    @cached_property
+    def _distinct_other(self):
+        # Code points past Latin-1, deduplicated so each is looked up once
+        return np.unique(self._code_points[~self._latin1], return_inverse=True)
+
+    def _count(self, predicate_name: str) -> np.ndarray:
+        """Per block, how many characters satisfy str.<predicate_name>()."""
+        code_points, latin1 = self._code_points, self._latin1
+
+        hits = np.empty(len(code_points), dtype=bool)
+        hits[latin1] = _LATIN1[predicate_name][code_points[latin1]]
+
+        distinct, inverse = self._distinct_other
+        if len(distinct):
+            table = np.fromiter(
+                (getattr(chr(cp), predicate_name)() for cp in distinct.tolist()),
+                dtype=bool,
+                count=len(distinct),
+            )
+            hits[~latin1] = table[inverse]
+
+        return np.bincount(self._owner, weights=hits, minlength=len(self.texts))
+
+    @cached_property
+    def has_digit(self) -> np.ndarray:
+        """Same semantics as any(c.isdigit() for c in text)."""
+        return self._count("isdigit") > 0
+
+    @cached_property
+    def upper_ratio(self) -> np.ndarray:
+        upper = self._count("isupper")
+        cased = upper + self._count("islower")
+        return np.divide(upper, cased, out=np.zeros(len(cased)), where=cased > 0)
+
+    @cached_property
+    def bboxes(self) -> np.ndarray:
+        if self._bboxes is None:
+            return np.zeros((len(self.texts), 4))
+        return np.asarray(self._bboxes, dtype=np.float64).reshape(-1, 4)
+
+    @cached_property
+    def font_height(self) -> np.ndarray:
+        return self.bboxes[:, 3] - self.bboxes[:, 1]
+
+    @cached_property
+    def relative_height(self) -> np.ndarray:
+        """Font height relative to the batch median (1.0 = body text)."""
+        median = np.median(self.font_height) if len(self.texts) else 0.0
+        if median <= 0:
+            return np.ones(len(self.texts))
+        return self.font_height / median
+
+    @cached_property
+    def y_position(self) -> np.ndarray:
+        """Vertical position of the block top, 0.0 (top) to 1.0 (bottom)."""
+        bottom = self.bboxes[:, 3].max() if len(self.texts) else 0.0
+        if bottom <= 0:
+            return np.zeros(len(self.texts))
+        return self.bboxes[:, 1] / bottom
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Assign ``label`` wherever ``when(features)`` is true.
+    """
+
+    label: str
+    when: Callable[[BlockFeatures], np.ndarray]
+
+
+class BatchBlockClassifier:
+    """
+    Classify a whole page of blocks at once.
+
+    Rules are checked in order; the first matching rule wins and
+    blocks matching none get ``default``. Pass a different rule list
+    to change the heuristics.
+    """
+
+    def __init__(self, rules: Sequence[Rule], default: str):
+        self.rules = list(rules)
+        self.default = default
+
+    def classify(
+        self,
+        texts: Sequence[str],
+        bboxes: Optional[Sequence] = None,
+    ) -> List[str]:
+        if len(texts) == 0:
+            return []
+
+        features = BlockFeatures(texts, bboxes)
+        labels = np.select(
+            [rule.when(features) for rule in self.rules],
+            [rule.label for rule in self.rules],
+            default=self.default,
+        )
+        return labels.tolist()
+
+
+# Mirrors vision.layout_utils.classify_block
+VISION_RULES = [
+    Rule("header", lambda f: f.is_upper & (f.length > 6)),
+    Rule("key_value", lambda f: f.has_digit),
+]
+
+# Mirrors document_model.layout.classify_block_type (on stripped text)
+DOCUMENT_RULES = [
+    Rule("heading", lambda f: f.is_upper & (f.length < 100)),
+    Rule("short_text", lambda f: f.length < 50),
+]
+
+vision_classifier = BatchBlockClassifier(VISION_RULES, default="paragraph")
+document_classifier = BatchBlockClassifier(DOCUMENT_RULES, default="paragraph")
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+MAGIC = b"DVB1"
+SUFFIX = ".dvb"
+
+# Arrays are 8-byte aligned so they can be viewed straight from the map
+_ALIGN = 8
+
+
+class ColumnarWriter:
+    """
+    Stream parsed blocks into the columnar ``.dvb`` format.
+
+    File layout
+    -----------
+    MAGIC | uint32 header length | JSON header | aligned arrays
+
+    Arrays: ``page`` int32 (n), ``bbox`` int32 (n, 4), ``confidence``
+    float32 (n), ``block_type`` uint8 (n, codes into the header's
+    ``block_types``), ``text_offsets`` int64 (n + 1) and ``text`` (the
+    UTF-8 texts, each followed by a newline).
+    """
+
+    def __init__(self, output_path: str | Path, source: str):
+        self.output_path = Path(output_path)
+        self.source = source
+
+        self._page = array("i")
+        self._bbox = array("i")
+        self._confidence = array("f")
+        self._block_type = array("B")
+        self._text_offsets = array("q", [0])
+        self._text = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+        self._type_codes: Dict[str, int] = {}
+
+    def add_blocks(self, blocks: Iterable[Dict]) -> None:
+        for block in blocks:
+            encoded = block.get("text", "").encode("utf-8") + b"\n"
+            self._text.write(encoded)
+            self._text_offsets.append(self._text_offsets[-1] + len(encoded))
+
+            self._page.append(block.get("page", 1))
+            self._bbox.extend(block.get("bbox") or (0, 0, 0, 0))
+            self._confidence.append(float(block.get("confidence", 0)))
+
+            block_type = block.get("block_type", "unknown")
+            code = self._type_codes.setdefault(block_type, len(self._type_codes))
+            self._block_type.append(code)
+
+    def close(self) -> None:
+        count = len(self._page)
+        self._text.seek(0)
+
+        columns = [
+            ("page", "<i4", [count], self._page.tobytes()),
+            ("bbox", "<i4", [count, 4], self._bbox.tobytes()),
+            ("confidence", "<f4", [count], self._confidence.tobytes()),
+            ("block_type", "u1", [count], self._block_type.tobytes()),
+            ("text_offsets", "<i8", [count + 1], self._text_offsets.tobytes()),
+            ("text", "u1", [self._text_offsets[-1]], self._text.read()),
+        ]
+
+        arrays = {}
+        offset = 0
+        for name, dtype, shape, data in columns:
+            arrays[name] = {"dtype": dtype, "shape": shape, "offset": offset}
+            offset += -(-len(data) // _ALIGN) * _ALIGN
+
+        header = json.dumps({
+            "source": self.source,
+            "count": count,
+            "block_types": list(self._type_codes),
+            "arrays": arrays,
+        }).encode("utf-8")
+        prefix_len = len(MAGIC) + 4 + len(header)
+        header += b" " * (-prefix_len % _ALIGN)
+
+        with self.output_path.open("wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for _, _, _, data in columns:
+                f.write(data)
+                f.write(b"\0" * (-len(data) % _ALIGN))
+
+        self._text.close()
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._text.close()
+
+
+class ColumnarDocument:
+    """
+    Memory-mapped view over a ``.dvb`` file.
+
+    Columns are NumPy views into the map; texts are only decoded when
+    asked for, so loading costs O(1) regardless of block count.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._map = np.memmap(self.path, dtype="u1", mode="r")
+
+        if bytes(self._map[:4]) != MAGIC:
+            raise ValueError(f"{self.path} is not a DocsVision columnar file")
+
+        (header_len,) = struct.unpack("<I", bytes(self._map[4:8]))
+        header = json.loads(bytes(self._map[8:8 + header_len]))
+        data_start = 8 + header_len
+
+        self.source: str = header["source"]
+        self.block_type_names: List[str] = header["block_types"]
+        self._count: int = header["count"]
+
+        columns = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            shape = tuple(spec["shape"])
+            columns[name] = np.frombuffer(
+                self._map,
+                dtype=dtype,
+                count=int(np.prod(shape)),
+                offset=data_start + spec["offset"],
+            ).reshape(shape)
+
+        self.pages: np.ndarray = columns["page"]
+        self.bboxes: np.ndarray = columns["bbox"]
+        self.confidences: np.ndarray = columns["confidence"]
+        self.block_types: np.ndarray = columns["block_type"]
+        self.text_offsets: np.ndarray = columns["text_offsets"]
+        self._text: np.ndarray = columns["text"]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def text(self, i: int) -> str:
+        start, end = self.text_offsets[i], self.text_offsets[i + 1] - 1
+        return bytes(self._text[start:end]).decode("utf-8")
+
+    def page_runs(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield (page, start, end) for each run of consecutive blocks on
+        the same page.
+        """
+        if not self._count:
+            return
+
+        breaks = np.flatnonzero(np.diff(self.pages)) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [self._count]))
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            yield int(self.pages[start]), start, end
+
+    def iter_page_texts(self) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Yield (page, texts) per page run, copying each run's bytes once
+        and cutting them at the stored offsets (texts may contain
+        newlines themselves).
+        """
+        for page, start, end in self.page_runs():
+            base = int(self.text_offsets[start])
+            raw = bytes(self._text[base:self.text_offsets[end]])
+            offsets = (self.text_offsets[start:end + 1] - base).tolist()
+            yield page, [
+                raw[a:b - 1].decode("utf-8") for a, b in zip(offsets, offsets[1:])
+            ]
+
+    def iter_blocks(self) -> Iterator[Dict]:
+        """
+        Rebuild block dicts (for JSON interchange); avoid on hot paths.
+        """
+        for i in range(self._count):
+            yield {
+                "text": self.text(i),
+                "bbox": self.bboxes[i].tolist(),
+                "confidence": float(self.confidences[i]),
+                "page": int(self.pages[i]),
+                "block_type": self.block_type_names[self.block_types[i]],
+            }
+
+    def to_json(self) -> Dict:
+        return {"source": self.source, "blocks": list(self.iter_blocks())}
+
+
+def write_columnar(
+    output_path: str | Path,
+    source: str,
+    pages: Iterable[List[Dict]],
+) -> None:
+    """
+    Write per-page blocks to a ``.dvb`` file.
+    """
+    with ColumnarWriter(output_path, source) as writer:
+        for blocks in pages:
+            writer.add_blocks(blocks)
+
+
+def read_columnar(path: str | Path) -> ColumnarDocument:
+    return ColumnarDocument(path)
@@ -2,12 +2,21 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List
+
+from .blocks import Block
+
+
+def _to_json(obj: Any) -> Any:
+    if isinstance(obj, Block):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def export_structured_document(
     structured_pages: List[Dict],
-    output_path: str | Path
+    output_path: str | Path,
+    indent: int | None = 2,
 ) -> None:
     """
     Export structured document pages to a JSON file.
@@ -18,6 +27,8 @@ def export_structured_document(
         Output from build_page_structure().
     output_path : str | Path
         Destination path for JSON file.
+    indent : int | None
+        JSON indentation; None writes compact JSON for large documents.
     """
 
     output_path = Path(output_path)
@@ -27,6 +38,8 @@ def export_structured_document(
         json.dump(
             structured_pages,
             f,
-            indent=2,
-            ensure_ascii=False
+            indent=indent,
+            separators=None if indent is not None else (",", ":"),
+            ensure_ascii=False,
+            default=_to_json,
         )
@@ -7,6 +7,9 @@ def classify_block_type(blocks):
     """
     Classify blocks based on text-only heuristics.
     blocks: list[str]
+
+    A plain loop on purpose: with rules this cheap it beats building
+    feature arrays (classifier.DOCUMENT_RULES is the batch equivalent).
     """
 
     classified = []
@@ -30,4 +33,3 @@ def classify_block_type(blocks):
         })
 
     return classified
-
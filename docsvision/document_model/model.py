@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .blocks import Block, normalize_ocr_output
+from .columnar import read_columnar, write_columnar
+from .layout import classify_block_type
+
+
+@dataclass
+class PageChangeSet:
+    """
+    Pages touched by an incremental DocumentModel update.
+    """
+
+    added: Set[int] = field(default_factory=set)
+    replaced: Set[int] = field(default_factory=set)
+    removed: Set[int] = field(default_factory=set)
+
+    @property
+    def changed(self) -> Set[int]:
+        """Pages whose content must be (re)built or (re)indexed."""
+        return self.added | self.replaced
+
+    @property
+    def touched(self) -> Set[int]:
+        """Every page whose previous index entries are now stale."""
+        return self.replaced | self.removed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.replaced or self.removed)
+
+
+class DocumentModel(Mapping):
+    """
+    Document model built in a single pass over normalized blocks.
+
+    ``blocks`` and ``pages`` are filled together while walking the
+    blocks once; derived views such as ``sections`` are computed on
+    first access and memoized. Behaves like the old dict contract, so
+    ``doc_model["blocks"]`` and ``doc_model.get("pages")`` still work.
+
+    Pages can be appended, replaced or removed in place; each update
+    returns a PageChangeSet so only those pages are re-processed.
+
+    Views
+    -----
+    blocks   : List[str]              (TEXT ONLY — no OCR metadata)
+    pages    : Dict[int, List[str]]
+    sections : List[Dict]             (lazy)
+    records  : List[Block]            (normalized blocks, with bbox/page)
+    """
+
+    _VIEWS = ("blocks", "pages", "sections")
+    _DERIVED = ("blocks", "records", "sections")
+
+    def __init__(self, records: List[Block]):
+        blocks: List[str] = []
+        pages: Dict[int, List[str]] = {}
+        page_records: Dict[int, List[Block]] = {}
+
+        for b in records:
+            blocks.append(b.text)
+
+            page_texts = pages.get(b.page)
+            if page_texts is None:
+                page_texts = pages[b.page] = []
+                page_records[b.page] = []
+            page_texts.append(b.text)
+            page_records[b.page].append(b)
+
+        self.pages = pages
+        self._page_records = page_records
+
+        # Seed the cached views from the construction pass
+        self.__dict__["blocks"] = blocks
+        self.__dict__["records"] = records
+
+    @cached_property
+    def blocks(self) -> List[str]:
+        return [text for page in self.pages.values() for text in page]
+
+    @cached_property
+    def records(self) -> List[Block]:
+        return [b for page in self._page_records.values() for b in page]
+
+    @cached_property
+    def sections(self) -> List[Dict]:
+        return classify_block_type(self.blocks)
+
+    def page_records(self, page: int) -> List[Block]:
+        return self._page_records.get(page, [])
+
+    # ---------------- Incremental updates ----------------
+
+    def _set_pages(self, page_records: Dict[int, List[Block]]) -> None:
+        for page, records in page_records.items():
+            self._page_records[page] = records
+            self.pages[page] = [b.text for b in records]
+
+        self._reorder()
+
+    def _reorder(self) -> None:
+        # Keep page order stable and drop views derived from the old pages
+        order = sorted(self._page_records)
+        self._page_records = {p: self._page_records[p] for p in order}
+        self.pages = {p: self.pages[p] for p in order}
+
+        for name in self._DERIVED:
+            self.__dict__.pop(name, None)
+
+    @staticmethod
+    def _group(records: Iterable[Block]) -> Dict[int, List[Block]]:
+        grouped: Dict[int, List[Block]] = {}
+        for b in records:
+            grouped.setdefault(b.page, []).append(b)
+        return grouped
+
+    def append_pages(self, ocr_result: List[Dict]) -> PageChangeSet:
+        """
+        Append a newly scanned batch after the current last page.
+
+        The batch's own page numbers (1, 2, ...) are shifted so its
+        first page follows the existing document.
+        """
+        offset = max(self._page_records, default=0)
+        new_pages = self._group(normalize_ocr_output(ocr_result, page_offset=offset))
+
+        self._set_pages(new_pages)
+        return PageChangeSet(added=set(new_pages))
+
+    def replace_pages(
+        self,
+        ocr_result: List[Dict],
+        pages: Optional[Iterable[int]] = None,
+    ) -> PageChangeSet:
+        """
+        Replace pages with re-scanned OCR output.
+
+        Page numbers in ``ocr_result`` are absolute. ``pages`` lists the
+        pages being replaced (default: those present in ``ocr_result``);
+        listed pages without new blocks end up empty and are removed.
+        """
+        new_pages = self._group(normalize_ocr_output(ocr_result))
+        targets = set(new_pages) if pages is None else set(pages)
+
+        changes = PageChangeSet()
+        for page in targets:
+            if page in new_pages:
+                if page in self._page_records:
+                    changes.replaced.add(page)
+                else:
+                    changes.added.add(page)
+            elif page in self._page_records:
+                changes.removed.add(page)
+
+        for page in changes.removed:
+            del self._page_records[page]
+            del self.pages[page]
+
+        self._set_pages({p: new_pages[p] for p in changes.changed})
+        return changes
+
+    def remove_pages(self, pages: Iterable[int]) -> PageChangeSet:
+        return self.replace_pages([], pages=pages)
+
+    # ---------------- Persistence ----------------
+
+    def save(self, path: str | Path, source: str = "") -> None:
+        """
+        Write the normalized blocks to a columnar ``.dvb`` file, so a
+        document can be reopened without running OCR again.
+        """
+        write_columnar(path, source, self._page_records.values())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "DocumentModel":
+        document = read_columnar(path)
+        page_counts: Dict[int, int] = {}
+        records: List[Block] = []
+
+        for block in document.iter_blocks():
+            page = block["page"]
+            index = page_counts.get(page, 0)
+            page_counts[page] = index + 1
+            records.append(Block(
+                id=f"{page}-{index}",
+                text=block["text"],
+                # Blocks without a box are stored as zeros
+                bbox=block["bbox"] if any(block["bbox"]) else None,
+                page=page,
+                confidence=block["confidence"],
+                block_type=block["block_type"],
+            ))
+
+        return cls(records)
+
+    # ---------------- Mapping contract ----------------
+
+    def __getitem__(self, key: str):
+        if key not in self._VIEWS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._VIEWS)
+
+    def __len__(self) -> int:
+        return len(self._VIEWS)
+
+    def __repr__(self) -> str:
+        return (
+            f"DocumentModel(pages={len(self.pages)}, "
+            f"blocks={sum(len(texts) for texts in self.pages.values())})"
+        )
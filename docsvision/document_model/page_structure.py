@@ -1,7 +1,49 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, Iterable, List
+
+from .model import PageChangeSet
+from .reading_order import reading_order
+
+
+def _structure_page(page_num: int, page_blocks: List[Dict]) -> Dict:
+    # Column-aware reading order (bands → columns → lines → x)
+    order = reading_order([b["bbox"] for b in page_blocks])
+    page_blocks = [page_blocks[i] for i in order]
+
+    sections = []
+    current_section = {
+        "heading": None,
+        "blocks": []
+    }
+
+    for block in page_blocks:
+        block_type = block.get("block_type")
+
+        if block_type == "heading":
+            # Start new section
+            if current_section["blocks"]:
+                sections.append(current_section)
+
+            current_section = {
+                "heading": block["text"],
+                "blocks": []
+            }
+
+        elif block_type in {"paragraph", "footer"}:
+            current_section["blocks"].append(block)
+
+        # ignore noise silently
+
+    # Append last section
+    if current_section["blocks"]:
+        sections.append(current_section)
+
+    return {
+        "page": page_num,
+        "sections": sections
+    }
 
 
 def build_page_structure(blocks: List[Dict]) -> List[Dict]:
@@ -28,46 +70,38 @@ def build_page_structure(blocks: List[Dict]) -> List[Dict]:
     for block in blocks:
         pages[block["page"]].append(block)
 
-    structured_pages: List[Dict] = []
-
     # 2️⃣ Process each page
-    for page_num in sorted(pages.keys()):
-        page_blocks = pages[page_num]
-
-        # Sort top → bottom using bbox y-coordinate
-        page_blocks.sort(key=lambda b: b["bbox"][1])
-
-        sections = []
-        current_section = {
-            "heading": None,
-            "blocks": []
-        }
-
-        for block in page_blocks:
-            block_type = block.get("block_type")
-
-            if block_type == "heading":
-                # Start new section
-                if current_section["blocks"]:
-                    sections.append(current_section)
-
-                current_section = {
-                    "heading": block["text"],
-                    "blocks": []
-                }
-
-            elif block_type in {"paragraph", "footer"}:
-                current_section["blocks"].append(block)
+    return [
+        _structure_page(page_num, pages[page_num])
+        for page_num in sorted(pages.keys())
+    ]
 
-            # ignore noise silently
 
-        # Append last section
-        if current_section["blocks"]:
-            sections.append(current_section)
+def update_page_structure(
+    structured_pages: List[Dict],
+    blocks: Iterable[Dict],
+    changes: PageChangeSet,
+) -> List[Dict]:
+    """
+    Apply a PageChangeSet to an existing build_page_structure() result.
 
-        structured_pages.append({
-            "page": page_num,
-            "sections": sections
-        })
+    Only pages in ``changes.changed`` are rebuilt (from the matching
+    entries of ``blocks``, which may hold just those pages); removed
+    pages are dropped and every other page is reused as-is.
+    """
+    changed = changes.changed
 
-    return structured_pages
+    pages = defaultdict(list)
+    for block in blocks:
+        if block["page"] in changed:
+            pages[block["page"]].append(block)
+
+    by_page = {
+        entry["page"]: entry
+        for entry in structured_pages
+        if entry["page"] not in changes.removed
+    }
+    for page_num in changed:
+        by_page[page_num] = _structure_page(page_num, pages[page_num])
+
+    return [by_page[page_num] for page_num in sorted(by_page)]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def _column_boundaries(x0: np.ndarray, x1: np.ndarray, min_gap: float) -> np.ndarray:
+    """
+    Split points between columns, from gaps in the x-projection.
+
+    The union of [x0, x1] intervals is computed with one sort and a
+    running maximum; any uncovered stretch wider than ``min_gap`` is a
+    column gutter, and its midpoint becomes a boundary.
+    """
+    if len(x0) < 2:
+        return np.empty(0)
+
+    order = np.argsort(x0)
+    starts = x0[order]
+    reach = np.maximum.accumulate(x1[order])
+
+    gaps = starts[1:] - reach[:-1]
+    is_gutter = gaps > min_gap
+
+    return (starts[1:][is_gutter] + reach[:-1][is_gutter]) / 2
+
+
+def reading_order(
+    bboxes: Sequence[Sequence[float]],
+    min_gap: Optional[float] = None,
+    span_ratio: float = 0.6,
+) -> np.ndarray:
+    """
+    Return indices that put a page's blocks in reading order.
+
+    Parameters
+    ----------
+    bboxes : Sequence of [x0, y0, x1, y1]
+        Block boxes of one page.
+    min_gap : float, optional
+        Narrowest gutter treated as a column break. Defaults to the
+        median block height.
+    span_ratio : float
+        Blocks wider than this fraction of the text width (titles,
+        full-width headings) span all columns and start a new band.
+
+    Returns
+    -------
+    np.ndarray
+        Permutation of ``range(len(bboxes))``: band by band, column by
+        column, then line by line and left to right.
+    """
+    boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    n = len(boxes)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+
+    x0, y0, x1, y1 = boxes.T
+    heights = y1 - y0
+    line_tol = max(float(np.median(heights)), 1.0)
+    if min_gap is None:
+        min_gap = line_tol
+
+    # 1️⃣ Full-width blocks split the page into horizontal bands
+    width = x1.max() - x0.min()
+    spanning = (x1 - x0) > span_ratio * width
+    band = np.searchsorted(np.sort(y0[spanning]), y0, side="right")
+
+    # 2️⃣ Columns from gutters in the projection of regular blocks
+    regular = ~spanning
+    bounds = _column_boundaries(x0[regular], x1[regular], min_gap)
+    column = np.searchsorted(bounds, (x0 + x1) / 2)
+    column[spanning] = -1
+
+    # 3️⃣ Lines: within a band/column, a new line starts wherever the
+    # vertical centre jumps by more than half a line height. Groups are
+    # folded into one float key so a single argsort orders everything.
+    group = band * (len(bounds) + 2) + (column + 1)
+    yc = (y0 + y1) / 2
+    span = yc.max() - yc.min() + 1
+    by_y = np.argsort(group * span + (yc - yc.min()))
+
+    new_line = (np.diff(group[by_y]) != 0) | (np.diff(yc[by_y]) > line_tol / 2)
+    line = np.empty(n, dtype=np.int64)
+    line[by_y] = np.concatenate(([0], np.cumsum(new_line)))
+
+    # 4️⃣ Line ids already follow band → column → top-to-bottom, so the
+    # final order only needs (line, x0)
+    x_span = x0.max() - x0.min() + 1
+    return np.argsort(line * x_span + (x0 - x0.min()))
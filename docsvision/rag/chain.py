@@ -21,7 +21,7 @@ def format_context(documents: List[Document]) -> str:
     formatted_chunks = []
 
     for doc in documents:
-        page = doc.metadata.get("page", "N/A")
+        page = doc.metadata.get("pages") or doc.metadata.get("page", "N/A")
         source = doc.metadata.get("source", "unknown")
 
         formatted_chunks.append(
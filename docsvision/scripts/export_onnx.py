@@ -0,0 +1,26 @@
+"""
+export_onnx.py
+
+Export the embedding model to int8 ONNX for the onnxruntime backend
+(DOCSVISION_EMBEDDING_BACKEND=onnx).
+
+Usage:
+python scripts/export_onnx.py [model_name] [output_dir]
+"""
+
+import sys
+
+from docsvision.core.onnx_embeddings import export_onnx_model
+
+
+def main():
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "sentence-transformers/all-MiniLM-L6-v2"
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+
+    print(f"🔹 Exporting {model_name} to ONNX (int8)...")
+    path = export_onnx_model(model_name, output_dir)
+    print(f"✅ Saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,48 +3,109 @@ ingest.py
 
 Usage:
 python scripts/ingest.py data/parsed_docs/sample.json
+python scripts/ingest.py data/parsed_docs/sample.dvb
 """
 
 import sys
-import json
 from pathlib import Path
 
-from docsvision.core.chunking import Chunker
-from docsvision.core.embedding import get_embeddings
-from docsvision.core.vectordb import get_vectorstore
+from docsvision.core.chunking import get_chunker
+from docsvision.core.dedup import ChunkDeduplicator
+from docsvision.core.embedding import DEFAULT_EMBEDDING_MODEL, get_embeddings
+from docsvision.core.json_stream import iter_json_array
+from docsvision.core.vectordb import (
+    collection_count,
+    fit_compression,
+    load_vectorstore,
+    upsert_documents,
+)
+from docsvision.document_model.columnar import SUFFIX as COLUMNAR_SUFFIX
+from docsvision.document_model.columnar import read_columnar
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python scripts/ingest.py <parsed_json_path>")
-        sys.exit(1)
+def load_parsed_document(path: Path):
+    """
+    Columnar .dvb files are memory-mapped; JSON files are streamed
+    block by block instead of being loaded with json.load.
+    """
+    if path.suffix == COLUMNAR_SUFFIX:
+        return read_columnar(path)
+
+    return iter_json_array(path, key="blocks")
 
-    json_path = Path(sys.argv[1])
-    if not json_path.exists():
-        raise FileNotFoundError(f"{json_path} does not exist")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        parsed_doc = json.load(f)
+def main(json_path=None, doc_id=None, source_name=None):
+    """
+    Chunk, deduplicate and upsert one parsed document; returns the
+    UpsertStats. ``doc_id`` identifies the file in the store (default:
+    its resolved path) and ``source_name`` is the cited source
+    (default: the file name without suffix). Callers ingesting a copy
+    of a file, such as an upload, pass a content hash and the original
+    name so that re-ingesting the same file changes nothing.
+    """
+    if json_path is None:
+        if len(sys.argv) != 2:
+            print("Usage: python scripts/ingest.py <parsed_json_or_dvb_path>")
+            sys.exit(1)
+        json_path = sys.argv[1]
 
-    source_name = json_path.stem
+    json_path = Path(json_path)
+    if not json_path.exists():
+        raise FileNotFoundError(f"{json_path} does not exist")
 
-    print("🔹 Chunking document...")
-    chunker = Chunker()
-    chunks = chunker.build_chunks(parsed_doc, source_name)
+    parsed_doc = load_parsed_document(json_path)
 
-    print(f"✅ Created {len(chunks)} chunks")
+    source_name = source_name or json_path.stem
+    # Files with the same name in different folders must not replace
+    # each other's chunks
+    doc_id = doc_id or str(json_path.resolve())
 
     print("🔹 Loading embeddings...")
     embeddings = get_embeddings()
 
-    print("🔹 Storing vectors in ChromaDB...")
-    vectordb = get_vectorstore(
-        documents=chunks,
-        embedding=embeddings,
+    print("🔹 Chunking and removing duplicate chunks...")
+    # Character chunks, or token chunks sized to the embedding model
+    # with DOCSVISION_CHUNK_UNIT=tokens
+    chunker = get_chunker(DEFAULT_EMBEDDING_MODEL)
+    dedup = ChunkDeduplicator()
+    # Chunks are produced while the file is parsed; duplicates are
+    # dropped before anything is embedded
+    chunks = dedup.deduplicate(chunker.iter_chunks(parsed_doc, source_name, doc_id))
+
+    # Re-ingesting embeds only new or changed chunks and removes the
+    # ones this source no longer produces. Chunks stream from the
+    # parser through dedup into the store, so the dedup counts are only
+    # known once the upsert has consumed them
+    print("🔹 Storing vectors...")
+    vectordb = load_vectorstore(embedding=embeddings)
+    # A compressed store fits its codec on a sample of the corpus first
+    chunks = fit_compression(vectordb, chunks)
+    upsert = upsert_documents(vectordb, chunks, doc_ids=[doc_id])
+    vectordb.persist()
+
+    print(f"✅ Created {dedup.stats.total} chunks")
+    print(
+        f"♻️ Skipped {dedup.stats.saved} duplicates "
+        f"({dedup.stats.exact} exact, {dedup.stats.near} near) — "
+        f"{dedup.stats.saved} embeddings saved"
+    )
+
+    print(
+        f"✅ Upserted: {upsert.added} added, {upsert.updated} updated, "
+        f"{upsert.unchanged} unchanged, {upsert.removed} removed"
     )
 
+    if hasattr(embeddings, "stats"):
+        cache = embeddings.stats()
+        print(
+            f"♻️ Embedding cache: {cache['hits']} hits / {cache['misses']} misses "
+            f"({cache['hit_rate']:.0%})"
+        )
+
     print("✅ Ingestion complete")
-    print(f"📦 Total vectors in DB: {vectordb._collection.count()}")
+    print(f"📦 Total vectors in DB: {collection_count(vectordb)}")
+
+    return upsert
 
 
 if __name__ == "__main__":
@@ -5,8 +5,14 @@ Usage:
 python scripts/query.py
 """
 from docsvision.rag.intent import classify_intent
-from docsvision.core.embedding import get_embeddings
-from docsvision.core.vectordb import load_vectorstore
+from docsvision.core.embedding import DEFAULT_EMBEDDING_MODEL, get_embeddings
+from docsvision.core.vectordb import (
+    DocumentCollections,
+    UpsertStats,
+    fit_compression,
+    load_vectorstore,
+    upsert_documents,
+)
 from docsvision.core.retriever import DocsVisionRetriever
 from docsvision.core.llm import get_llm
 from docsvision.core.llm import get_fast_llm
@@ -89,13 +95,15 @@ def is_context_sufficient(docs, question: str, min_chars: int = 50) -> bool:
 
 
 def format_citations(docs):
-    pages = sorted(
-        {
-            doc.metadata.get("page")
-            for doc in docs
-            if doc.metadata.get("page") is not None
-        }
-    )
+    pages = set()
+    for doc in docs:
+        # "pages" also lists the pages of deduplicated copies
+        merged = doc.metadata.get("pages")
+        if merged:
+            pages.update(int(p) for p in merged.split(","))
+        elif doc.metadata.get("page") is not None:
+            pages.add(doc.metadata["page"])
+    pages = sorted(pages)
 
     if not pages:
         return "No sources found"
@@ -105,68 +113,142 @@ def format_citations(docs):
 
 def init_rag_runtime():
     embeddings = get_embeddings()
-    vectordb = load_vectorstore(embedding=embeddings)
-
-    retriever = DocsVisionRetriever(vectordb, k=5)
+    collections = DocumentCollections(embeddings)
+    vectordb = load_vectorstore(embedding=embeddings, client=collections.client)
 
     fast_llm = get_fast_llm()   # 🔥 new
     smart_llm = get_llm()       # 70B
 
-    rag_chain = build_rag_chain(
-        llm=smart_llm,
-        retriever=retriever.retriever,
-    )
-
-    return {
+    runtime = {
         "embeddings": embeddings,
-        "vectordb": vectordb,
-        "retriever": retriever,
+        "collections": collections,
         "fast_llm": fast_llm,
         "smart_llm": smart_llm,
-        "rag_chain": rag_chain,
     }
+    bind_vectorstore(runtime, vectordb)
+    return runtime
 
-from langchain_core.documents import Document
 
-def ingest_doc_model_into_vectordb(doc_model, vectordb, chunk_size=500):
-    blocks = doc_model["blocks"]
+def bind_vectorstore(runtime, vectordb):
+    """
+    Point the runtime's retriever and RAG chain at ``vectordb``.
+    """
+    retriever = DocsVisionRetriever(vectordb, k=5)
 
-    texts = []
-    for block in blocks:
-        # handle dict-based blocks
-        if isinstance(block, dict):
-            text = block.get("text", "").strip()
-        else:
-            text = str(block).strip()
-
-        if text:
-            texts.append(text)
-
-    # -------- Chunking --------
-    chunks = []
-    current = ""
-
-    for text in texts:
-        if len(current) + len(text) <= chunk_size:
-            current += " " + text
-        else:
-            chunks.append(current.strip())
-            current = text
-
-    if current.strip():
-        chunks.append(current.strip())
-
-    # -------- Store --------
-    docs = []
-    for i, chunk in enumerate(chunks):
-        docs.append(
-            Document(
-                page_content=chunk,
-                metadata={"page": i // 3 + 1}
-            )
-        )
+    runtime["vectordb"] = vectordb
+    runtime["retriever"] = retriever
+    runtime["rag_chain"] = build_rag_chain(
+        llm=runtime["smart_llm"],
+        retriever=retriever.retriever,
+    )
+    return vectordb
+
+
+def use_document(runtime, doc_hash):
+    """
+    Switch the runtime to the collection of one document.
+    Returns True if that document is already indexed.
+    """
+    collections = runtime["collections"]
+    bind_vectorstore(runtime, collections.get(doc_hash))
+    return collections.is_indexed(doc_hash)
+
+from itertools import chain
+
+from docsvision.core.chunking import get_chunker
+from docsvision.core.dedup import ChunkDeduplicator
+
+
+def _page_chunk_documents(doc_model, pages, chunk_size, source_name, doc_id):
+    # Chunks never span pages and keep their real page, char offsets
+    # and source bboxes
+    chunker = get_chunker(DEFAULT_EMBEDDING_MODEL, chunk_size=chunk_size)
+    records = chain.from_iterable(doc_model.page_records(page) for page in pages)
+
+    return chunker.iter_page_chunks(
+        chunker.iter_pages(records, drop_sparse=False),
+        source_name,
+        doc_id,
+    )
+
+
+def ingest_doc_model_into_vectordb(
+    doc_model,
+    vectordb,
+    chunk_size=500,
+    source_name="document",
+    doc_id=None,
+):
+    """
+    Chunk, deduplicate and upsert the whole document model (chunks
+    already indexed for this file are not embedded again). ``doc_id``
+    (default: ``source_name``) identifies the file in the store.
+    Returns (DedupStats, UpsertStats).
+    """
+    doc_id = doc_id or source_name
+    dedup = ChunkDeduplicator()
+    docs = dedup.deduplicate(
+        _page_chunk_documents(doc_model, doc_model["pages"], chunk_size, source_name, doc_id)
+    )
+    docs = fit_compression(vectordb, docs)
+    return dedup.stats, upsert_documents(vectordb, docs, doc_ids=[doc_id])
+
+
+def _duplicate_group_pages(vectordb, doc_id, pages):
+    """
+    Grow ``pages`` with every page whose chunks were deduplicated
+    against a chunk on those pages (the merged ``pages`` metadata),
+    until no stored duplicate group is only partly covered.
+    """
+    stored = vectordb.get(where={"doc_id": doc_id}, include=["metadatas"])
+    groups = [
+        {int(p) for p in metadata["pages"].split(",")}
+        for metadata in stored["metadatas"]
+        if "," in (metadata.get("pages") or "")
+    ]
+
+    scope = set(pages)
+    grown = True
+    while grown:
+        grown = False
+        for group in groups:
+            if group & scope and not group <= scope:
+                scope |= group
+                grown = True
+    return scope
+
+
+def sync_doc_model_pages_into_vectordb(
+    doc_model,
+    vectordb,
+    changes,
+    chunk_size=500,
+    source_name="document",
+    doc_id=None,
+):
+    """
+    Re-index only the pages in a PageChangeSet: chunks of added and
+    replaced pages are upserted, and whatever else those pages (or the
+    removed ones) held for this file is deleted.
+
+    A chunk kept by deduplication stands for copies on other pages, so
+    the whole duplicate group of any chunk on those pages is
+    re-chunked and deduplicated again; otherwise replacing the page
+    that held the kept copy would drop it for the unchanged pages too.
+    """
+    if not changes:
+        return UpsertStats()
+
+    doc_id = doc_id or source_name
+    scope = _duplicate_group_pages(vectordb, doc_id, changes.changed | changes.touched)
+    pages = sorted(scope & doc_model["pages"].keys())
+
+    dedup = ChunkDeduplicator()
+    docs = dedup.deduplicate(
+        _page_chunk_documents(doc_model, pages, chunk_size, source_name, doc_id)
+    )
+    return upsert_documents(vectordb, docs, pages=scope, doc_ids=[doc_id])
 
-    vectordb.add_documents(docs)
 
 def summarize_document_from_model(doc_model, llm):
     texts = extract_clean_text(doc_model)
@@ -0,0 +1,166 @@
+"""
+aggregation.py
+
+Responsibility:
+- Merge word-level OCR blocks into line or paragraph blocks
+- Prefer Tesseract's block/par/line numbering when present
+- Fall back to a bbox grid index for words without it
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from statistics import median
+from typing import Dict, List
+
+GRANULARITIES = ("word", "line", "paragraph")
+
+_LINE_FIELDS = ("block_num", "par_num", "line_num")
+
+
+def _merge(words: List[Dict]) -> Dict:
+    x0 = min(w["bbox"][0] for w in words)
+    y0 = min(w["bbox"][1] for w in words)
+    x1 = max(w["bbox"][2] for w in words)
+    y1 = max(w["bbox"][3] for w in words)
+
+    counts = [w.get("words", 1) for w in words]
+    total = sum(counts)
+
+    merged = {
+        "text": " ".join(w["text"] for w in words),
+        "bbox": [x0, y0, x1, y1],
+        # Word-weighted, so paragraphs average over words, not lines
+        "confidence": sum(w["confidence"] * n for w, n in zip(words, counts)) / total,
+        "words": total,
+    }
+    for field in _LINE_FIELDS:
+        if field in words[0]:
+            merged[field] = words[0][field]
+
+    return merged
+
+
+class _RowIndex:
+    """
+    Uniform grid over y-centres for finding the open line a word
+    belongs to without scanning every line on the page.
+    """
+
+    def __init__(self, cell: float):
+        self.cell = max(cell, 1.0)
+        self.cells = defaultdict(list)
+
+    def _cell(self, y: float) -> int:
+        return int(y // self.cell)
+
+    def add(self, line_id: int, y: float) -> None:
+        self.cells[self._cell(y)].append(line_id)
+
+    def near(self, y: float):
+        c = self._cell(y)
+        for key in (c - 1, c, c + 1):
+            yield from self.cells.get(key, ())
+
+
+def _geometric_lines(words: List[Dict]) -> List[List[Dict]]:
+    """
+    Group words into lines by vertical overlap and horizontal gap.
+    """
+    if not words:
+        return []
+
+    height = median(w["bbox"][3] - w["bbox"][1] for w in words) or 1
+    index = _RowIndex(height)
+    lines: List[List[Dict]] = []
+
+    for word in sorted(words, key=lambda w: w["bbox"][0]):
+        x0, y0, _, y1 = word["bbox"]
+        yc = (y0 + y1) / 2
+
+        target = None
+        for line_id in index.near(yc):
+            last = lines[line_id][-1]["bbox"]
+            overlap = min(y1, last[3]) - max(y0, last[1])
+            gap = x0 - last[2]
+            if overlap > 0.5 * min(y1 - y0, last[3] - last[1]) and gap < 3 * height:
+                target = line_id
+                break
+
+        if target is None:
+            target = len(lines)
+            lines.append([])
+            index.add(target, yc)
+
+        lines[target].append(word)
+
+    lines.sort(key=lambda ws: (min(w["bbox"][1] for w in ws), ws[0]["bbox"][0]))
+    return lines
+
+
+def _geometric_paragraphs(lines: List[Dict]) -> List[List[Dict]]:
+    """
+    Stack consecutive lines that are close vertically and overlap
+    horizontally.
+    """
+    paragraphs: List[List[Dict]] = []
+
+    for line in lines:
+        if paragraphs:
+            prev = paragraphs[-1][-1]["bbox"]
+            x0, y0, x1, y1 = line["bbox"]
+            height = max(y1 - y0, prev[3] - prev[1])
+            if (
+                0 <= y0 - prev[3] < height
+                and min(x1, prev[2]) > max(x0, prev[0])
+            ):
+                paragraphs[-1].append(line)
+                continue
+        paragraphs.append([line])
+
+    return paragraphs
+
+
+def aggregate_blocks(blocks: List[Dict], granularity: str = "line") -> List[Dict]:
+    """
+    Merge one page's word blocks into lines or paragraphs.
+
+    Merged blocks carry the joined text, the union bbox, the mean
+    confidence and the number of source words, in reading order of
+    their first word.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(
+            f"Unknown granularity '{granularity}'. Choose from: {', '.join(GRANULARITIES)}"
+        )
+    if granularity == "word" or not blocks:
+        return blocks
+
+    numbered = defaultdict(list)
+    loose = []
+    for block in blocks:
+        if all(field in block for field in _LINE_FIELDS):
+            key = tuple(block[field] for field in _LINE_FIELDS)
+            numbered[key].append(block)
+        else:
+            loose.append(block)
+
+    lines = [_merge(words) for words in numbered.values()]
+    lines.extend(_merge(words) for words in _geometric_lines(loose))
+
+    if granularity == "line":
+        return lines
+
+    by_par = defaultdict(list)
+    loose_lines = []
+    for line in lines:
+        if "block_num" in line:
+            by_par[(line["block_num"], line["par_num"])].append(line)
+        else:
+            loose_lines.append(line)
+
+    paragraphs = [_merge(group) for group in by_par.values()]
+    paragraphs.extend(
+        _merge(group) for group in _geometric_paragraphs(loose_lines)
+    )
+    return paragraphs
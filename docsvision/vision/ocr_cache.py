@@ -0,0 +1,117 @@
+"""
+ocr_cache.py
+
+Responsibility:
+- Content-addressed on-disk cache for per-page OCR output
+- Keyed by rendered page pixels + DPI + OCR engine and config
+- Size-bounded with least-recently-used eviction
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class OCRCache:
+    def __init__(
+        self,
+        cache_dir: str | Path = "storage/ocr_cache",
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(p.stat().st_size for p in self._entries())
+
+    @staticmethod
+    def page_key(
+        image,
+        dpi: int = 300,
+        config: str = "",
+        engine: str = "pytesseract",
+    ) -> str:
+        """
+        Hash the rendered pixels together with everything that can
+        change the OCR output for them.
+        """
+        h = hashlib.sha256()
+        h.update(f"{image.mode}|{image.size}|{dpi}|{engine}|{config}|".encode())
+        h.update(image.tobytes())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entries(self):
+        return self.cache_dir.glob("*/*.json")
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        path = self._path(key)
+
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                blocks = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        # Bump mtime so eviction sees this entry as recently used
+        os.utime(path)
+        self.hits += 1
+        return blocks
+
+    def put(self, key: str, blocks: List[Dict]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        payload = json.dumps(blocks, ensure_ascii=False).encode("utf-8")
+
+        # Write-then-rename so concurrent readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+
+        old_size = path.stat().st_size if path.exists() else 0
+        os.replace(tmp_path, path)
+        self._size += len(payload) - old_size
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        # Trim to 90% of the budget so we don't evict on every put
+        target = int(self.max_bytes * 0.9)
+
+        entries = []
+        for path in self._entries():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self._size,
+        }
@@ -1,13 +1,74 @@
 import fitz
 from PIL import Image
 
-def pdf_to_images(pdf_path, dpi=300):
-    doc = fitz.open(pdf_path)
-    images = []
 
-    for page in doc:
-        pix = page.get_pixmap(dpi=dpi)
-        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-        images.append(img)
+def render_page(page, dpi=300):
+    pix = page.get_pixmap(dpi=dpi)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def extract_text_layer(page, dpi=300):
+    """
+    Read a page's embedded text layer as word blocks.
+
+    Blocks follow the extract_text_with_boxes schema, with bboxes in
+    the pixel space of a render at `dpi` so both paths line up.
+    """
+    matrix = page.rotation_matrix * fitz.Matrix(dpi / 72, dpi / 72)
+    blocks = []
+
+    for x0, y0, x1, y1, text, block_no, line_no, _ in page.get_text("words"):
+        if not text.strip():
+            continue
+
+        rect = fitz.Rect(x0, y0, x1, y1) * matrix
+        blocks.append({
+            "text": text,
+            "bbox": [
+                int(rect.x0),
+                int(rect.y0),
+                int(rect.x1),
+                int(rect.y1),
+            ],
+            "confidence": 100.0,
+            # PyMuPDF blocks are paragraph-like; map them onto
+            # Tesseract's block/par/line numbering
+            "block_num": block_no,
+            "par_num": 1,
+            "line_num": line_no,
+        })
+
+    return blocks
+
 
-    return images
+def iter_pdf_pages(pdf_path, dpi=300, min_words=10):
+    """
+    Yield (image, blocks) per page; exactly one of the two is set.
+
+    Pages whose text layer has at least `min_words` words come back
+    as ready blocks; image-only pages are rendered for OCR.
+    """
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            blocks = extract_text_layer(page, dpi=dpi) if min_words else []
+
+            if blocks and len(blocks) >= min_words:
+                yield None, blocks
+            else:
+                yield render_page(page, dpi=dpi), None
+
+
+def iter_pdf_images(pdf_path, dpi=300):
+    """
+    Render a PDF one page at a time.
+
+    Only the page being yielded is held in memory, so peak usage
+    does not grow with the page count.
+    """
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            yield render_page(page, dpi=dpi)
+
+
+def pdf_to_images(pdf_path, dpi=300):
+    return list(iter_pdf_images(pdf_path, dpi=dpi))
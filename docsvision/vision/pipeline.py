@@ -1,38 +1,313 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from pathlib import Path
+import argparse
+import hashlib
 import json
+import os
+import textwrap
 
-from docsvision.vision.pdf_reader import pdf_to_images
+from docsvision.document_model.columnar import SUFFIX as COLUMNAR_SUFFIX
+from docsvision.document_model.columnar import ColumnarWriter
+from docsvision.document_model.classifier import vision_classifier
+from docsvision.vision.aggregation import GRANULARITIES, aggregate_blocks
+from docsvision.vision.pdf_reader import iter_pdf_pages
 from docsvision.vision.image_reader import load_image
+from docsvision.vision.ocr_cache import OCRCache
 from docsvision.vision.ocr_engine import extract_text_with_boxes
-from docsvision.vision.layout_utils import classify_block
 
 
-def process_document(path):
+def _label_blocks(page_no, blocks):
+    # One batch classification per page (same rules as classify_block)
+    labels = vision_classifier.classify(
+        [block["text"] for block in blocks],
+        [block["bbox"] for block in blocks],
+    )
+
+    for block, label in zip(blocks, labels):
+        block["page"] = page_no
+        block["block_type"] = label
+
+    return blocks
+
+
+class _InlineExecutor:
+    """Run submitted work immediately; stands in for a process pool."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def _ready(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def iter_page_sources(path, dpi=300, text_layer=True):
+    """
+    Yield (image, blocks) per page; exactly one of the two is set.
+
+    Born-digital PDF pages are read from their text layer; scanned
+    pages and plain images are returned as images for OCR.
+    """
     path = str(path)
     if path.lower().endswith(".pdf"):
-        images = pdf_to_images(path)
+        yield from iter_pdf_pages(path, dpi=dpi, min_words=10 if text_layer else 0)
     else:
-        images = [load_image(path)]
+        yield load_image(path), None
 
-    document = []
 
-    for page_no, img in enumerate(images, start=1):
-        blocks = extract_text_with_boxes(img)
+def _count_path(stats, img):
+    if stats is not None:
+        key = "ocr" if img is not None else "text_layer"
+        stats[key] = stats.get(key, 0) + 1
+
 
-        for block in blocks:
-            block["page"] = page_no
-            block["block_type"] = classify_block(block)
+def iter_document_pages(
+    path,
+    workers=1,
+    window=None,
+    text_layer=True,
+    stats=None,
+    dpi=300,
+    ocr_config="",
+    ocr_engine="pytesseract",
+    cache=None,
+    granularity="word",
+):
+    """
+    Yield the blocks of each page, in page order.
 
+    Pages are rendered lazily; with workers > 1 up to `window`
+    pages (default 2 * workers) are rendered and OCR'd concurrently.
+    `ocr_engine` picks the backend from vision.ocr_engine.OCR_ENGINES;
+    each worker process keeps its engine warm across pages.
+    If `cache` (an OCRCache) is given, pages whose pixels were seen
+    before skip Tesseract. `granularity` ("word", "line" or
+    "paragraph") merges words into larger blocks before classification.
+    If `stats` is a dict, it receives per-path page counts
+    ("text_layer" / "ocr").
+    """
+    sources = iter_page_sources(path, dpi=dpi, text_layer=text_layer)
+
+    if workers and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        window = window or 2 * workers
+    else:
+        pool = _InlineExecutor()
+        window = 1
+
+    # Keep at most `window` rendered pages in flight so memory stays
+    # bounded; Executor.map would drain the whole generator up front.
+    pending = deque()
+
+    def finish(page_no, key, future):
+        blocks = future.result()
+        if key is not None:
+            cache.put(key, blocks)
+        return _label_blocks(page_no, aggregate_blocks(blocks, granularity))
+
+    with pool:
+        for page_no, (img, blocks) in enumerate(sources, start=1):
+            _count_path(stats, img)
+            key = None
+
+            if img is not None and cache is not None:
+                key = cache.page_key(
+                    img, dpi=dpi, config=ocr_config, engine=ocr_engine
+                )
+                blocks = cache.get(key)
+                if blocks is not None:
+                    key = None
+
+            if blocks is not None:
+                future = _ready(blocks)
+            else:
+                future = pool.submit(
+                    extract_text_with_boxes, img, ocr_config, ocr_engine
+                )
+            pending.append((page_no, key, future))
+            del img
+
+            if len(pending) >= window:
+                yield finish(*pending.popleft())
+
+        while pending:
+            yield finish(*pending.popleft())
+
+
+def process_document(
+    path,
+    workers=1,
+    window=None,
+    text_layer=True,
+    stats=None,
+    dpi=300,
+    ocr_config="",
+    ocr_engine="pytesseract",
+    cache=None,
+    granularity="word",
+):
+    """
+    Extract a PDF or image into a flat list of word blocks.
+
+    Pages with a usable text layer skip OCR, cached pages skip it too,
+    and workers > 1 sends each remaining page to its own process.
+    Blocks come back in page order, merged to `granularity`.
+    """
+    document = []
+
+    pages = iter_document_pages(
+        path,
+        workers=workers,
+        window=window,
+        text_layer=text_layer,
+        stats=stats,
+        dpi=dpi,
+        ocr_config=ocr_config,
+        ocr_engine=ocr_engine,
+        cache=cache,
+        granularity=granularity,
+    )
+    for blocks in pages:
         document.extend(blocks)
 
     return document
 
 
+def write_parsed_json(output_path, source, pages):
+    """
+    Stream per-page blocks to the parsed JSON file.
+
+    Produces the same layout as json.dump(..., indent=2) without
+    holding the whole document in memory.
+    """
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        f.write(f'  "source": {json.dumps(source, ensure_ascii=False)},\n')
+        f.write('  "blocks": [')
+
+        first = True
+        for blocks in pages:
+            for block in blocks:
+                f.write("\n" if first else ",\n")
+                f.write(textwrap.indent(
+                    json.dumps(block, indent=2, ensure_ascii=False), "    "
+                ))
+                first = False
+
+        f.write("]\n}" if first else "\n  ]\n}")
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(manifest_path):
+    """
+    Manifest format:
+    {"files": {name: {"sha256": ..., "granularity": ..., "outputs": [...]}}}
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"files": {}}
+
+
+def save_manifest(manifest, manifest_path):
+    # Atomic replace so an interrupted run never leaves a torn manifest
+    tmp_path = Path(f"{manifest_path}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+
+_worker_cache = None
+
+
+def _tee_pages(pages, writer):
+    for blocks in pages:
+        writer.add_blocks(blocks)
+        yield blocks
+
+
+def _process_file(file_path, output_paths, granularity="word"):
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = OCRCache()
+
+    hits, misses = _worker_cache.hits, _worker_cache.misses
+    stats = {}
+
+    pages = iter_document_pages(
+        file_path,
+        stats=stats,
+        cache=_worker_cache,
+        granularity=granularity,
+    )
+
+    # Write under temp names; only completed outputs get the real ones
+    tmp_paths = {fmt: Path(f"{path}.tmp") for fmt, path in output_paths.items()}
+
+    if "binary" in tmp_paths:
+        with ColumnarWriter(tmp_paths["binary"], file_path.name) as writer:
+            pages = _tee_pages(pages, writer)
+            if "json" in tmp_paths:
+                write_parsed_json(tmp_paths["json"], file_path.name, pages)
+            else:
+                for _ in pages:
+                    pass
+    else:
+        write_parsed_json(tmp_paths["json"], file_path.name, pages)
+
+    for fmt, tmp_path in tmp_paths.items():
+        os.replace(tmp_path, output_paths[fmt])
+
+    stats["cache_hits"] = _worker_cache.hits - hits
+    stats["cache_misses"] = _worker_cache.misses - misses
+    return stats
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Run the DocsVision vision pipeline")
+    parser.add_argument("--raw-dir", default="docsvision/data/raw_docs")
+    parser.add_argument("--parsed-dir", default="docsvision/data/parsed_docs")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="number of files processed in parallel",
+    )
+    parser.add_argument(
+        "--granularity", choices=GRANULARITIES, default="line",
+        help="merge OCR words into lines or paragraphs before saving",
+    )
+    parser.add_argument(
+        "--format", choices=("json", "binary", "both"), default="json",
+        help="parsed output: indent=2 JSON, columnar .dvb, or both",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="reprocess files even if the manifest says they are unchanged",
+    )
+    args = parser.parse_args()
+
     print("🚀 Running vision pipeline...")
 
-    raw_dir = Path("docsvision/data/raw_docs")
-    parsed_dir = Path("docsvision/data/parsed_docs")
+    raw_dir = Path(args.raw_dir)
+    parsed_dir = Path(args.parsed_dir)
     parsed_dir.mkdir(parents=True, exist_ok=True)
 
     SUPPORTED_EXTENSIONS = {".pdf" , ".png" , ".jpeg" , ".jpg"}
@@ -43,25 +318,74 @@ def main():
     ]
     print(f"📂 Found {len(files)} raw files")
 
+    manifest_path = parsed_dir / "manifest.json"
+    manifest = load_manifest(manifest_path)
+
+    formats = ("json", "binary") if args.format == "both" else (args.format,)
+    suffixes = {"json": ".json", "binary": COLUMNAR_SUFFIX}
+
+    todo = {}
     for file_path in files:
-        print(f"➡️ Processing {file_path.name}")
+        digest = file_sha256(file_path)
+        output_paths = {
+            fmt: parsed_dir / f"{file_path.stem}{suffixes[fmt]}"
+            for fmt in formats
+        }
+        entry = manifest["files"].get(file_path.name)
+
+        if (
+            not args.force
+            and entry is not None
+            and entry["sha256"] == digest
+            and entry.get("granularity", "word") == args.granularity
+            and all(path.exists() for path in output_paths.values())
+        ):
+            continue
+
+        todo[file_path] = (digest, output_paths)
+
+    print(f"⏭️ Skipping {len(files) - len(todo)} unchanged files")
 
-        blocks = process_document(str(file_path))
+    cache_hits = cache_misses = 0
+    workers = max(1, min(args.workers, len(todo)))
 
-        output = {
-            "source": file_path.name,
-            "blocks": blocks,
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                _process_file, file_path, output_paths, args.granularity
+            ): file_path
+            for file_path, (_, output_paths) in todo.items()
         }
 
-        output_path = parsed_dir / f"{file_path.stem}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        for future in as_completed(futures):
+            file_path = futures[future]
+            digest, output_paths = todo[file_path]
 
-        print(f"✅ Saved {output_path}")
+            try:
+                stats = future.result()
+            except Exception as e:
+                print(f"❌ Failed {file_path.name}: {e}")
+                continue
 
+            # Record each file as soon as it lands so reruns resume here
+            manifest["files"][file_path.name] = {
+                "sha256": digest,
+                "granularity": args.granularity,
+                "outputs": [path.name for path in output_paths.values()],
+            }
+            save_manifest(manifest, manifest_path)
+
+            cache_hits += stats["cache_hits"]
+            cache_misses += stats["cache_misses"]
+            print(
+                f"✅ Saved {', '.join(str(p) for p in output_paths.values())} "
+                f"(text layer: {stats.get('text_layer', 0)} pages, "
+                f"OCR: {stats.get('ocr', 0)} pages)"
+            )
+
+    print(f"🗃️ OCR cache: {cache_hits} hits, {cache_misses} misses")
     print("🎉 Vision pipeline completed")
 
 
 if __name__ == "__main__":
     main()
-
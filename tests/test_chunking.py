@@ -0,0 +1,63 @@
+import pytest
+from tokenizers import Regex, Tokenizer, models, pre_tokenizers
+from transformers import PreTrainedTokenizerFast
+
+from docsvision.core import chunking
+from docsvision.core.chunking import Chunker, get_chunker
+
+
+def word_piece_tokenizer():
+    # Every word is split into 3-character pieces
+    vocab = {"[UNK]": 0}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.Sequence([
+        pre_tokenizers.WhitespaceSplit(),
+        pre_tokenizers.Split(Regex(".{1,3}"), behavior="isolated"),
+    ])
+    return PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]")
+
+
+def pages():
+    words = [f"word{i % 37}" for i in range(400)]
+    return [
+        {"text": " ".join(words[i:i + 10]), "page": 1 + i // 200, "bbox": [0, i, 10, i + 5]}
+        for i in range(0, 400, 10)
+    ]
+
+
+def test_get_chunker_defaults_to_characters(monkeypatch):
+    monkeypatch.delenv("DOCSVISION_CHUNK_UNIT", raising=False)
+    chunker = get_chunker(chunk_size=300, chunk_overlap=50)
+
+    assert chunker.tokenizer is None
+    assert chunker.chunk_size == 300
+
+
+def test_get_chunker_reads_the_unit_from_the_environment(monkeypatch):
+    monkeypatch.setenv("DOCSVISION_CHUNK_UNIT", "tokens")
+    monkeypatch.setattr(
+        Chunker, "for_model",
+        classmethod(lambda cls, name: cls(60, 10, tokenizer=word_piece_tokenizer())),
+    )
+    chunking._model_chunker.cache_clear()
+
+    chunker = get_chunker("some/model")
+    assert chunker.tokenizer is not None
+    assert get_chunker("some/model") is chunker
+
+    monkeypatch.setenv("DOCSVISION_CHUNK_UNIT", "words")
+    with pytest.raises(ValueError):
+        get_chunker("some/model")
+    chunking._model_chunker.cache_clear()
+
+
+def test_token_chunks_fit_the_budget():
+    tokenizer = word_piece_tokenizer()
+    chunker = Chunker(chunk_size=60, chunk_overlap=10, tokenizer=tokenizer)
+
+    docs = list(chunker.iter_chunks({"blocks": pages()}, "doc.pdf"))
+
+    assert docs
+    for doc in docs:
+        assert len(tokenizer(doc.page_content, add_special_tokens=False)["input_ids"]) <= 60
+    assert {doc.metadata["page"] for doc in docs} == {1, 2}
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from docsvision.document_model.classifier import (
+    BlockFeatures,
+    document_classifier,
+    vision_classifier,
+)
+from docsvision.document_model.layout import classify_block_type
+from docsvision.vision.layout_utils import classify_block
+
+EDGE_CASES = [
+    "",
+    " ",
+    "   \n",
+    "TOTAL",
+    "INVOICE",
+    "INVOICE 2024",
+    "Invoice",
+    "x²",
+    "Ⅻ",
+    "٣ items",
+    "ÉTÉ ÉTÉ",
+    "straße",
+    "ǅungla",
+    "ǅUNGLA",
+    "A" * 99,
+    "A" * 100,
+    "a" * 49,
+    "a" * 50,
+    "  PADDED HEADING  ",
+    "𝐀𝐁𝐂𝐃𝐄𝐅𝐆",
+    "line one\nLINE TWO 3",
+]
+
+
+def random_texts(n, seed=0):
+    rng = random.Random(seed)
+    words = ["TOTAL", "Amount", "due", "INVOICE", "No.", "2024", "the", "of", "x²", "ÉTÉ", "", " "]
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(0, 25)))
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("texts", [EDGE_CASES, random_texts(2000)])
+def test_vision_rules_match_classify_block(texts):
+    expected = [classify_block({"text": t}) for t in texts]
+    assert vision_classifier.classify(texts) == expected
+
+
+@pytest.mark.parametrize("texts", [EDGE_CASES, random_texts(2000)])
+def test_document_rules_match_classify_block_type(texts):
+    expected = [block["type"] for block in classify_block_type(texts)]
+    stripped = [t.strip() for t in texts if t.strip()]
+    assert document_classifier.classify(stripped) == expected
+
+
+def test_features_match_str_methods():
+    features = BlockFeatures(EDGE_CASES)
+
+    assert features.length.tolist() == [len(t) for t in EDGE_CASES]
+    assert features.is_upper.tolist() == [t.isupper() for t in EDGE_CASES]
+    assert features.has_digit.tolist() == [
+        any(c.isdigit() for c in t) for t in EDGE_CASES
+    ]
+    for text, ratio in zip(EDGE_CASES, features.upper_ratio):
+        upper = sum(c.isupper() for c in text)
+        cased = upper + sum(c.islower() for c in text)
+        assert ratio == pytest.approx(upper / cased if cased else 0.0)
+
+
+def test_one_long_block_does_not_pad_the_batch():
+    texts = ["x" * 1_000_000] + ["y"] * 10_000
+    features = BlockFeatures(texts)
+
+    assert features._code_points.nbytes == 4 * sum(map(len, texts))
+    assert not features.has_digit.any()
+
+
+def test_empty_batch():
+    assert vision_classifier.classify([]) == []
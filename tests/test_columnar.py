@@ -0,0 +1,68 @@
+from docsvision.core.chunking import Chunker
+from docsvision.document_model import DocumentModel, build_document_model
+from docsvision.document_model.columnar import read_columnar, write_columnar
+
+PAGES = [
+    [
+        {"text": "Title", "bbox": [0, 0, 100, 20], "confidence": 99.0, "page": 1, "block_type": "heading"},
+        {"text": "first line\nsecond line", "bbox": [0, 30, 200, 60], "confidence": 90.0, "page": 1, "block_type": "paragraph"},
+        {"text": "tail", "bbox": [0, 70, 50, 80], "confidence": 80.0, "page": 1, "block_type": "paragraph"},
+    ],
+    [
+        {"text": "naïve café\n\nünïcode", "bbox": [5, 5, 50, 50], "confidence": 70.0, "page": 2, "block_type": "paragraph"},
+        {"text": "", "bbox": [1, 2, 3, 4], "confidence": 0.0, "page": 2, "block_type": "unknown"},
+    ],
+]
+
+
+def write(tmp_path):
+    path = tmp_path / "doc.dvb"
+    write_columnar(path, "doc.pdf", PAGES)
+    return read_columnar(path)
+
+
+def test_round_trip_preserves_blocks(tmp_path):
+    doc = write(tmp_path)
+    blocks = [block for page in PAGES for block in page]
+
+    assert len(doc) == len(blocks)
+    assert doc.source == "doc.pdf"
+    assert list(doc.iter_blocks()) == blocks
+    assert [doc.text(i) for i in range(len(doc))] == [b["text"] for b in blocks]
+
+
+def test_page_texts_with_newlines_stay_aligned(tmp_path):
+    doc = write(tmp_path)
+
+    assert list(doc.iter_page_texts()) == [
+        (1, ["Title", "first line\nsecond line", "tail"]),
+        (2, ["naïve café\n\nünïcode", ""]),
+    ]
+
+
+def test_chunk_provenance_from_columnar(tmp_path):
+    doc = write(tmp_path)
+    pages = list(Chunker().iter_pages(doc, drop_sparse=False))
+
+    assert [p.page for p in pages] == [1, 2]
+    assert pages[0].bboxes == [[0, 0, 100, 20], [0, 30, 200, 60], [0, 70, 50, 80]]
+    assert pages[1].bboxes == [[5, 5, 50, 50]]
+    assert pages[0].text.endswith("tail")
+    assert "ünïcode" in pages[1].text
+    for page in pages:
+        assert len(page.starts) == len(page.bboxes)
+
+
+def test_document_model_save_and_load(tmp_path):
+    ocr = [
+        {"text": "Title", "bbox": [0, 0, 100, 20], "confidence": 50, "page": 1},
+        {"text": "body", "page": 1},
+        {"text": "appendix", "bbox": [0, 0, 10, 10], "confidence": 75, "page": 3},
+    ]
+    model = build_document_model(ocr)
+    model.save(tmp_path / "doc.dvb", source="doc.pdf")
+
+    loaded = DocumentModel.load(tmp_path / "doc.dvb")
+
+    assert loaded.pages == model.pages
+    assert loaded.records == model.records
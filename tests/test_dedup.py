@@ -0,0 +1,94 @@
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from docsvision.core.dedup import ChunkDeduplicator
+from docsvision.core.vectordb import load_vectorstore
+from docsvision.document_model.blocks import normalize_ocr_output
+from docsvision.document_model.model import DocumentModel
+from docsvision.scripts.query import (
+    ingest_doc_model_into_vectordb,
+    sync_doc_model_pages_into_vectordb,
+)
+
+TERMS = "Terms and conditions apply to every order placed with the company."
+
+
+@pytest.fixture(params=["chroma", "mmap"])
+def vectordb(request, tmp_path):
+    return load_vectorstore(
+        DeterministicFakeEmbedding(size=16),
+        persist_directory=str(tmp_path),
+        backend=request.param,
+    )
+
+
+def ocr(texts_by_page):
+    return [{"text": text, "page": page} for page, text in texts_by_page.items()]
+
+
+def stored(vectordb):
+    result = vectordb.get(where={"doc_id": "doc"})
+    return sorted(zip(result["documents"], (m["pages"] for m in result["metadatas"])))
+
+
+def test_deduplicate_streams():
+    consumed = []
+
+    def chunks():
+        for page in (1, 2, 3):
+            consumed.append(page)
+            yield Document(page_content=TERMS, metadata={"source": "a", "page": page})
+
+    dedup = ChunkDeduplicator()
+    stream = dedup.deduplicate(chunks())
+
+    first = next(stream)
+    assert consumed == [1]
+    assert first.metadata["pages"] == "1"
+
+    assert list(stream) == []
+    assert first.metadata["pages"] == "1,2,3"
+    assert (dedup.stats.total, dedup.stats.exact) == (3, 2)
+
+
+def test_merged_pages_are_written_after_the_stream(vectordb):
+    doc_model = DocumentModel(normalize_ocr_output(ocr({1: TERMS, 2: TERMS, 3: TERMS})))
+
+    ingest_doc_model_into_vectordb(doc_model, vectordb, doc_id="doc")
+
+    assert stored(vectordb) == [(TERMS, "1,2,3")]
+
+
+def test_replacing_the_kept_page_keeps_its_duplicates(vectordb):
+    doc_model = DocumentModel(normalize_ocr_output(ocr({1: TERMS, 2: TERMS, 3: TERMS})))
+    ingest_doc_model_into_vectordb(doc_model, vectordb, doc_id="doc")
+
+    changes = doc_model.replace_pages(ocr({1: "Order summary for the first quarter."}))
+    sync_doc_model_pages_into_vectordb(doc_model, vectordb, changes, doc_id="doc")
+
+    assert stored(vectordb) == [
+        ("Order summary for the first quarter.", "1"),
+        (TERMS, "2,3"),
+    ]
+
+
+def test_removing_a_duplicate_page_shrinks_the_group(vectordb):
+    doc_model = DocumentModel(normalize_ocr_output(ocr({1: TERMS, 2: TERMS, 3: TERMS})))
+    ingest_doc_model_into_vectordb(doc_model, vectordb, doc_id="doc")
+
+    changes = doc_model.remove_pages([3])
+    sync_doc_model_pages_into_vectordb(doc_model, vectordb, changes, doc_id="doc")
+
+    assert stored(vectordb) == [(TERMS, "1,2")]
+
+
+def test_empty_change_set_is_a_no_op(vectordb):
+    doc_model = DocumentModel(normalize_ocr_output(ocr({1: TERMS})))
+    ingest_doc_model_into_vectordb(doc_model, vectordb, doc_id="doc")
+
+    changes = doc_model.append_pages([])
+    stats = sync_doc_model_pages_into_vectordb(doc_model, vectordb, changes, doc_id="doc")
+
+    assert (stats.added, stats.removed) == (0, 0)
+    assert stored(vectordb) == [(TERMS, "1")]
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from docsvision.core.mmap_store import MmapVectorStore, matches_filter
+
+
+def open_store(tmp_path, **kwargs):
+    return MmapVectorStore(
+        DeterministicFakeEmbedding(size=16),
+        persist_directory=str(tmp_path),
+        collection_name="test",
+        **kwargs,
+    )
+
+
+def fill(store, n=10):
+    texts = [f"text {i}" for i in range(n)]
+    store.add_texts(texts, [{"row": i, "page": i % 3} for i in range(n)], ids=texts)
+    return texts
+
+
+def contents(store):
+    result = store.get()
+    return dict(zip(result["ids"], (m["row"] for m in result["metadatas"])))
+
+
+def test_reload_replays_adds_deletes_and_updates(tmp_path):
+    store = open_store(tmp_path)
+    fill(store)
+    store.delete(["text 1", "text 2"])
+    store.update_metadatas(["text 3"], [{"row": 33, "page": 0}])
+
+    reopened = open_store(tmp_path)
+
+    assert reopened.count() == 8
+    assert contents(reopened) == contents(store)
+    assert contents(reopened)["text 3"] == 33
+    assert reopened.similarity_search("text 5", k=1)[0].page_content == "text 5"
+
+
+def test_compact_reclaims_rows_and_survives_reload(tmp_path):
+    store = open_store(tmp_path)
+    fill(store)
+    store.delete([f"text {i}" for i in range(0, 10, 2)])
+    before = {d.page_content for d in store.similarity_search("text 3", k=5)}
+
+    store.compact()
+
+    assert len(store._ids) == store.count() == 5
+    assert len(np.load(store.path / "vectors.npy", mmap_mode="r")) == 5
+    assert not os.path.exists(str(store.path) + ".compact")
+    assert not os.path.exists(str(store.path) + ".old")
+    assert {d.page_content for d in store.similarity_search("text 3", k=5)} == before
+
+    store.add_texts(["new"], [{"row": 10, "page": 1}], ids=["new"])
+    reopened = open_store(tmp_path)
+    assert contents(reopened) == contents(store)
+    assert reopened.similarity_search("new", k=1)[0].page_content == "new"
+
+
+def test_interrupted_compaction_keeps_previous_files(tmp_path):
+    store = open_store(tmp_path)
+    fill(store)
+    store.delete(["text 0"])
+    expected = contents(store)
+
+    # Crash between the two renames of compact()
+    os.replace(store.path, str(store.path) + ".old")
+    os.makedirs(str(store.path) + ".compact")
+
+    reopened = open_store(tmp_path)
+    assert contents(reopened) == expected
+    assert not os.path.exists(str(store.path) + ".compact")
+
+
+def test_filtered_search(tmp_path):
+    store = open_store(tmp_path)
+    fill(store)
+
+    docs = store.similarity_search("text 4", k=10, filter={"page": {"$in": [1]}})
+
+    assert {d.metadata["row"] for d in docs} == {1, 4, 7}
+    assert matches_filter({"page": 2, "row": 5}, {"$and": [{"page": 2}, {"row": {"$gte": 5}}]})
+    assert not matches_filter({"page": 2}, {"$or": [{"page": 1}, {"page": {"$gt": 2}}]})
+
+
+def test_hnsw_matches_exact_search(tmp_path):
+    pytest.importorskip("hnswlib")
+    texts = fill(exact := open_store(tmp_path / "exact", hnsw_threshold=1000), 200)
+    fill(hnsw := open_store(tmp_path / "hnsw", hnsw_threshold=0), 200)
+    exact.delete(texts[:50])
+    hnsw.delete(texts[:50])
+
+    for query in ("text 60", "text 150"):
+        expected = [d.page_content for d in exact.similarity_search(query, k=5)]
+        assert [d.page_content for d in hnsw.similarity_search(query, k=5)] == expected
+
+    hnsw.persist()
+    reopened = open_store(tmp_path / "hnsw", hnsw_threshold=0)
+    assert reopened.similarity_search("text 60", k=1)[0].page_content == "text 60"
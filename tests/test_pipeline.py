@@ -0,0 +1,76 @@
+import fitz
+
+from docsvision.vision import pdf_reader, pipeline
+
+
+def make_pdf(path, pages, words=12):
+    doc = fitz.open()
+    for page_no in range(1, pages + 1):
+        page = doc.new_page()
+        for i in range(words):
+            page.insert_text((72, 72 + 14 * i), f"page{page_no}word{i}")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def text_block(page_no, i):
+    return {
+        "text": f"page{page_no}word{i}",
+        "bbox": [10, 10 + 20 * i, 100, 25 + 20 * i],
+        "confidence": 100.0,
+        "block_num": 1,
+        "par_num": 1,
+        "line_num": i,
+    }
+
+
+def test_process_document_keeps_page_order(tmp_path):
+    pdf = make_pdf(tmp_path / "doc.pdf", pages=6)
+    stats = {}
+
+    blocks = pipeline.process_document(pdf, workers=3, stats=stats)
+
+    pages = [block["page"] for block in blocks]
+    assert pages == sorted(pages)
+    assert set(pages) == set(range(1, 7))
+    assert all("block_type" in block for block in blocks)
+    assert stats == {"text_layer": 6}
+
+
+def test_iter_document_pages_bounds_window(monkeypatch):
+    produced = []
+
+    def fake_sources(path, dpi=300, text_layer=True):
+        for page_no in range(1, 21):
+            produced.append(page_no)
+            yield None, [text_block(page_no, i) for i in range(3)]
+
+    monkeypatch.setattr(pipeline, "iter_page_sources", fake_sources)
+
+    consumed = 0
+    for expected, blocks in enumerate(
+        pipeline.iter_document_pages("doc.pdf", workers=4, window=3), start=1
+    ):
+        consumed += 1
+        assert {block["page"] for block in blocks} == {expected}
+        assert len(produced) - consumed < 3
+
+    assert consumed == 20
+
+
+def test_iter_pdf_images_renders_lazily(tmp_path, monkeypatch):
+    pdf = make_pdf(tmp_path / "doc.pdf", pages=5, words=1)
+    rendered = []
+
+    def fake_render(page, dpi=300):
+        rendered.append(page.number)
+        return page.number
+
+    monkeypatch.setattr(pdf_reader, "render_page", fake_render)
+
+    images = pdf_reader.iter_pdf_images(pdf)
+    assert next(images) == 0
+    assert rendered == [0]
+
+    assert list(images) == [1, 2, 3, 4]
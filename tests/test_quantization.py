@@ -0,0 +1,89 @@
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from docsvision.core.quantization import CompressedEmbeddings, VectorCodec
+from docsvision.core.vectordb import fit_compression, load_vectorstore, upsert_documents
+from docsvision.document_model import build_document_model
+from docsvision.scripts.query import ingest_doc_model_into_vectordb
+
+
+def texts(n):
+    return [f"chunk number {i}" for i in range(n)]
+
+
+def compressed(tmp_path, min_fit_vectors=64):
+    return CompressedEmbeddings(
+        DeterministicFakeEmbedding(size=32),
+        VectorCodec.from_spec("pca8-int8"),
+        codec_path=tmp_path / "codec.npz",
+        min_fit_vectors=min_fit_vectors,
+    )
+
+
+def test_small_batch_is_stored_uncompressed(tmp_path):
+    embeddings = compressed(tmp_path)
+
+    assert len(embeddings.embed_documents(texts(10))[0]) == 32
+    assert embeddings.codec.spec == "float32"
+    assert compressed(tmp_path).codec.spec == "float32"
+    assert len(compressed(tmp_path).embed_query("anything")) == 32
+
+
+def test_explicit_fit_is_saved_and_reused(tmp_path):
+    embeddings = compressed(tmp_path).fit(texts(100))
+
+    assert len(embeddings.embed_documents(texts(3))[0]) == 8
+    assert not compressed(tmp_path).codec.needs_fit
+
+
+def test_unfitted_query_is_not_reduced(tmp_path):
+    assert len(compressed(tmp_path).embed_query("anything")) == 32
+
+
+@pytest.mark.parametrize("backend", ["chroma", "mmap"])
+def test_empty_compressed_store_returns_no_results(tmp_path, backend):
+    vectordb = load_vectorstore(
+        DeterministicFakeEmbedding(size=32),
+        persist_directory=str(tmp_path),
+        compression="pca8-int8",
+        backend=backend,
+    )
+
+    assert vectordb.similarity_search("anything", k=3) == []
+
+
+@pytest.mark.parametrize("backend", ["chroma", "mmap"])
+def test_fit_compression_samples_the_stream(tmp_path, backend):
+    vectordb = load_vectorstore(
+        DeterministicFakeEmbedding(size=32),
+        persist_directory=str(tmp_path),
+        compression="pca8-int8",
+        backend=backend,
+    )
+    docs = [Document(page_content=t, metadata={"source": "a", "page": 1}) for t in texts(300)]
+
+    stats = upsert_documents(vectordb, fit_compression(vectordb, docs, sample_size=256))
+
+    assert stats.added == 300
+    assert not vectordb.embeddings.codec.needs_fit
+    assert len(vectordb.similarity_search("chunk number 7", k=3)) == 3
+
+
+@pytest.mark.parametrize("backend", ["chroma", "mmap"])
+def test_small_document_in_a_compressed_store(tmp_path, backend):
+    def open_store():
+        return load_vectorstore(
+            DeterministicFakeEmbedding(size=32),
+            persist_directory=str(tmp_path),
+            compression="pca8-int8",
+            backend=backend,
+        )
+
+    doc_model = build_document_model([{"text": "A single short page.", "page": 1}])
+    _, stats = ingest_doc_model_into_vectordb(doc_model, open_store(), doc_id="doc")
+
+    assert stats.added == 1
+    reopened = open_store()
+    assert reopened.embeddings.codec.spec == "float32"
+    assert reopened.similarity_search("A single short page.", k=1)[0].metadata["page"] == 1
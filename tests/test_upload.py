@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from docsvision.api.routes import upload
+from docsvision.core import vectordb as vectordb_module
+from docsvision.scripts import ingest
+
+PARSED = {
+    "source": "report.pdf",
+    "blocks": [
+        {"text": f"Paragraph {i} of the quarterly report with enough words to keep.", "page": i // 3 + 1}
+        for i in range(9)
+    ],
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "get_embeddings", lambda: DeterministicFakeEmbedding(size=16))
+    monkeypatch.setattr(
+        ingest,
+        "load_vectorstore",
+        lambda embedding: vectordb_module.load_vectorstore(
+            embedding, persist_directory=str(tmp_path / "store"), backend="mmap"
+        ),
+    )
+
+    ingested = []
+
+    def ingest_main(path, **kwargs):
+        ingested.append(Path(path))
+        return ingest.main(path, **kwargs)
+
+    monkeypatch.setattr(upload, "ingest_main", ingest_main)
+
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/upload")
+    client = TestClient(app)
+    client.ingested = ingested
+    return client
+
+
+def post(client, name="report.json"):
+    response = client.post("/upload/", files={"file": (name, json.dumps(PARSED).encode())})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_uploading_the_same_file_twice_adds_nothing(client):
+    first = post(client)
+    second = post(client)
+
+    assert first["added"] > 0
+    assert (second["added"], second["removed"]) == (0, 0)
+    assert second["unchanged"] == first["added"]
+    assert not any(path.exists() for path in client.ingested)
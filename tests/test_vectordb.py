@@ -0,0 +1,148 @@
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from docsvision.core.vectordb import (
+    DocumentCollections,
+    chunk_id,
+    collection_count,
+    load_vectorstore,
+    upsert_documents,
+)
+from docsvision.document_model import build_document_model
+
+
+@pytest.fixture(params=["chroma", "mmap"])
+def vectordb(request, tmp_path):
+    return load_vectorstore(
+        DeterministicFakeEmbedding(size=16),
+        persist_directory=str(tmp_path),
+        backend=request.param,
+    )
+
+
+def chunks(doc_id, texts_by_page, source="report.pdf"):
+    return [
+        Document(
+            page_content=text,
+            metadata={"source": source, "doc_id": doc_id, "page": page, "pages": str(page)},
+        )
+        for page, texts in texts_by_page.items()
+        for text in texts
+    ]
+
+
+def stored(vectordb, doc_id):
+    result = vectordb.get(where={"doc_id": doc_id})
+    return sorted(zip(result["documents"], (m["pages"] for m in result["metadatas"])))
+
+
+def counts(stats):
+    return stats.added, stats.updated, stats.unchanged, stats.removed
+
+
+def test_upsert_is_idempotent(vectordb):
+    docs = chunks("a", {1: ["one", "two"], 2: ["three"]})
+
+    assert counts(upsert_documents(vectordb, docs)) == (3, 0, 0, 0)
+    assert counts(upsert_documents(vectordb, docs)) == (0, 0, 3, 0)
+    assert len(vectordb.get(include=[])["ids"]) == 3
+
+
+def test_changed_and_dropped_chunks(vectordb):
+    upsert_documents(vectordb, chunks("a", {1: ["one", "two"], 2: ["three"]}))
+
+    stats = upsert_documents(vectordb, chunks("a", {1: ["one", "TWO"]}), doc_ids=["a"])
+
+    assert counts(stats) == (1, 0, 1, 2)
+    assert stored(vectordb, "a") == [("TWO", "1"), ("one", "1")]
+
+
+def test_metadata_is_refreshed_in_place(vectordb):
+    docs = chunks("a", {1: ["footer", "body"]})
+    upsert_documents(vectordb, docs)
+
+    docs[0].metadata["pages"] = "1,2,3"
+    assert counts(upsert_documents(vectordb, docs)) == (0, 1, 1, 0)
+    assert stored(vectordb, "a") == [("body", "1"), ("footer", "1,2,3")]
+
+
+def test_page_scoped_upsert(vectordb):
+    upsert_documents(vectordb, chunks("a", {1: ["one"], 2: ["two"], 3: ["three"]}))
+
+    stats = upsert_documents(
+        vectordb, chunks("a", {2: ["new two"]}), pages=[2, 3], doc_ids=["a"]
+    )
+
+    assert counts(stats) == (1, 0, 0, 2)
+    assert stored(vectordb, "a") == [("new two", "2"), ("one", "1")]
+
+
+def test_same_file_name_different_files(vectordb):
+    upsert_documents(vectordb, chunks("/x/report.json", {1: ["from x"]}))
+    upsert_documents(vectordb, chunks("/y/report.json", {1: ["from y"]}))
+
+    assert stored(vectordb, "/x/report.json") == [("from x", "1")]
+    assert stored(vectordb, "/y/report.json") == [("from y", "1")]
+    assert chunk_id(chunks("/x/report.json", {1: ["same"]})[0]) != chunk_id(
+        chunks("/y/report.json", {1: ["same"]})[0]
+    )
+
+
+def test_doc_id_defaults_to_source(vectordb):
+    doc = Document(page_content="text", metadata={"source": "s.pdf", "page": 1})
+    upsert_documents(vectordb, [doc])
+
+    assert vectordb.get(where={"doc_id": "s.pdf"}, include=[])["ids"] == [chunk_id(doc)]
+
+
+def test_collection_count(vectordb):
+    upsert_documents(vectordb, chunks("a", {1: ["one", "two"], 2: ["three"]}))
+
+    assert collection_count(vectordb) == 3
+
+
+@pytest.mark.parametrize("backend", ["chroma", "mmap"])
+def test_document_collections_drop_and_reuse(tmp_path, backend):
+    collections = DocumentCollections(
+        DeterministicFakeEmbedding(size=16),
+        persist_directory=str(tmp_path),
+        max_open=1,
+        backend=backend,
+    )
+
+    upsert_documents(collections.get("a" * 32), chunks("a", {1: ["one"]}))
+    # Partly indexed until the document model is saved
+    assert not collections.is_indexed("a" * 32)
+    collections.save_model("a" * 32, build_document_model([{"text": "one", "page": 1}]))
+    assert collections.is_indexed("a" * 32)
+    assert not collections.is_indexed("b" * 32)
+
+    collections.get("b" * 32)
+    assert list(collections._open) == ["b" * 32]
+
+    collections.drop("a" * 32)
+    assert not collections.is_indexed("a" * 32)
+
+
+def test_document_collections_keep_the_document_model(tmp_path):
+    collections = DocumentCollections(
+        DeterministicFakeEmbedding(size=16), persist_directory=str(tmp_path)
+    )
+    model = build_document_model([{"text": "one", "page": 1}, {"text": "two", "page": 2}])
+
+    assert collections.load_model("a" * 32) is None
+    collections.save_model("a" * 32, model)
+    assert collections.load_model("a" * 32).pages == {1: ["one"], 2: ["two"]}
+
+    collections.drop("a" * 32)
+    assert collections.load_model("a" * 32) is None
+
+
+def test_empty_page_scope_deletes_nothing(vectordb):
+    upsert_documents(vectordb, chunks("a", {1: ["one"]}))
+
+    stats = upsert_documents(vectordb, [], pages=[], doc_ids=["a"])
+
+    assert counts(stats) == (0, 0, 0, 0)
+    assert stored(vectordb, "a") == [("one", "1")]